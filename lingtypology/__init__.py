@@ -1,6 +1,7 @@
 from lingtypology.maps import LingMap, merge, gradient, get_elevations
 import lingtypology.datasets
 import lingtypology.glottolog
+import lingtypology.associations
 
 __citation__ = \
     '@misc{MichaelVoronov2669068,\n' \
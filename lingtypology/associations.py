@@ -0,0 +1,279 @@
+"""
+Functions
+~~~~~~~~~
+
+Associations module computes pairwise association statistics between
+categorical features (e.g. WALS chapters) of a table returned by
+``Wals.get_df``. Use ``join_how='outer'``, otherwise only languages that have
+values for all the chapters are left.
+
+Values are coded as integers once (the ``_<feature>_num`` columns of Wals)
+and contingency tables of one feature against all the others are counted
+with a single ``numpy.bincount`` (one per stratum), so there is no
+``pandas.crosstab`` call per pair.
+
+-  lingtypology.associations.\\ **contingency_table** (*df*, *feature1*, *feature2*)
+
+   **Returns** *pandas.DataFrame*: counts of languages for each pair of values.
+
+-  lingtypology.associations.\\ **get_associations** (*df*, *features=None*, *stratify_by=None*, *processes=None*)
+
+   **Returns** *pandas.DataFrame* with one row per pair of features. Headers:
+   'feature1', 'feature2', 'languages', 'chi2', 'cramers_v'.
+
+-  lingtypology.associations.\\ **cramers_v** (*df*, *features=None*, *stratify_by=None*, *processes=None*)
+
+   **Returns** *pandas.DataFrame*: symmetric matrix of Cramér's V.
+
+**Parameters**:
+
+*   **df** (*pandas.DataFrame* or *lingtypology.datasets.Wals*)
+        Table returned by ``Wals.get_df``. If Wals object is given,
+        ``get_df(join_how='outer')`` is called.
+*   **features** (*list* of *str*, default *None*)
+        WALS features (e.g. ``['1A', '2A']``). If None, all the features
+        of the table.
+*   **stratify_by** (*str*, default *None*)
+        Column (e.g. ``'family'`` or ``'genus'``) used to control for
+        genealogy. If given, contingency tables are counted within each
+        family, chi-square statistics are summed over the families and
+        Cramér's V is normalized by the sum of the within-family maxima.
+        Languages with a missing value of the column and families of
+        one language (which say nothing about the association) are
+        ignored, also in the 'languages' count.
+*   **processes** (*int*, default *None*)
+        If greater than 1, features are distributed among that many
+        processes (``concurrent.futures.ProcessPoolExecutor``).
+"""
+import numpy
+import pandas
+import concurrent.futures
+import re
+
+
+def _feature_columns(df, features):
+    """Names of the integer-coded columns of the given features"""
+    if features is None:
+        return [
+            column for column in df.columns \
+                if re.fullmatch(r'_.+_num', str(column))
+        ]
+    return ['_{}_num'.format(feature.upper()) for feature in features]
+
+
+def _factorize(values):
+    """Integer codes (-1 for missing values) and the unique values"""
+    values = pandas.Series(values)
+    values = values.where(values != '~N/A~')
+    codes, uniques = pandas.factorize(values, sort=True)
+    return codes.astype(numpy.int64), uniques
+
+
+def _get_df(df):
+    if not isinstance(df, pandas.DataFrame):
+        df = df.get_df(join_how='outer')
+    return df
+
+
+# Arrays shared by the tasks of get_associations. In worker processes they
+# are set once by the pool initializer instead of being sent with each task.
+_shared = {}
+
+
+def _init(codes, sizes, strata):
+    """Store the arrays and split the rows into strata"""
+    if strata is None:
+        groups = [numpy.arange(len(codes))]
+    else:
+        # Strata with less than two languages add nothing to chi-square
+        # and to its maximum, so they are not counted at all
+        order = numpy.argsort(strata, kind='stable')
+        counts = numpy.bincount(strata[strata >= 0])
+        bounds = numpy.cumsum(counts) + (strata < 0).sum()
+        groups = [
+            order[stop - count:stop] \
+                for count, stop in zip(counts, bounds) if count > 1
+        ]
+    _shared.update(codes=codes, sizes=sizes, groups=groups)
+
+
+def _count(x, others, n_x, n_y):
+    """Languages, chi-square statistics and their maxima (x against others)"""
+    k = others.shape[1]
+    valid = (x >= 0)[:, None] & (others >= 0)
+    index = (numpy.arange(k)[None, :] * n_x + x[:, None]) * n_y + others
+    tables = numpy.bincount(
+        index[valid], minlength=k * n_x * n_y
+    ).reshape(k, n_x, n_y).astype(float)
+
+    n = tables.sum(axis=(1, 2))
+    rows = tables.sum(axis=2)
+    cols = tables.sum(axis=1)
+    with numpy.errstate(divide='ignore', invalid='ignore'):
+        expected = rows[:, :, None] * cols[:, None, :] / n[:, None, None]
+        chi2 = numpy.where(
+            expected > 0, (tables - expected) ** 2 / expected, 0
+        ).sum(axis=(1, 2))
+    dof = numpy.minimum((rows > 0).sum(axis=1), (cols > 0).sum(axis=1)) - 1
+    return n.astype(numpy.int64), chi2, n * numpy.maximum(dof, 0)
+
+
+def _statistics(i):
+    """Statistics of feature i against features i+1, i+2, ...
+
+    Contingency tables of all the pairs are counted with one bincount
+    call per stratum, so only one stratum is held in memory at a time.
+
+    Returns
+    -------
+    tuple of numpy.ndarray
+        Numbers of languages, chi-square statistics and Cramér's V.
+    """
+    codes, sizes = _shared['codes'], _shared['sizes']
+    x = codes[:, i]
+    others = codes[:, i + 1:]
+    n_x = sizes[i]
+    n_y = max(sizes[i + 1:].max(), 1) if others.shape[1] else 1
+    n = numpy.zeros(others.shape[1], dtype=numpy.int64)
+    chi2 = numpy.zeros(others.shape[1])
+    maximum = numpy.zeros(others.shape[1])
+    for group in _shared['groups']:
+        group_n, group_chi2, group_maximum = _count(
+            x[group], others[group], n_x, n_y
+        )
+        n += group_n
+        chi2 += group_chi2
+        maximum += group_maximum
+    with numpy.errstate(divide='ignore', invalid='ignore'):
+        v = numpy.sqrt(numpy.where(maximum > 0, chi2 / maximum, numpy.nan))
+    return n, chi2, v
+
+
+def _statistics_chunk(rows):
+    """Statistics of the given features (one task of the process pool)"""
+    return [_statistics(i) for i in rows]
+
+
+def contingency_table(df, feature1, feature2):
+    """Contingency table of two features.
+
+    Parameters
+    ----------
+    df: pandas.DataFrame or lingtypology.datasets.Wals
+        Table returned by ``Wals.get_df``.
+    feature1: str
+        WALS feature (rows).
+    feature2: str
+        WALS feature (columns).
+
+    Returns
+    -------
+    pandas.DataFrame
+        Index: values of feature1. Headers: values of feature2.
+    """
+    df = _get_df(df)
+    column1, column2 = _feature_columns(df, [feature1, feature2])
+    x, x_values = _factorize(df[column1])
+    y, y_values = _factorize(df[column2])
+    valid = (x >= 0) & (y >= 0)
+    table = numpy.bincount(
+        x[valid] * len(y_values) + y[valid],
+        minlength=len(x_values) * len(y_values)
+    ).reshape(len(x_values), len(y_values))
+    return pandas.DataFrame(
+        table,
+        index=pandas.Index(x_values, name=feature1),
+        columns=pandas.Index(y_values, name=feature2)
+    )
+
+
+def get_associations(df, features=None, stratify_by=None, processes=None):
+    """Pairwise association statistics of the features.
+
+    Parameters
+    ----------
+    df: pandas.DataFrame or lingtypology.datasets.Wals
+        Table returned by ``Wals.get_df``.
+    features: list of str, default None
+        WALS features. If None, all the features of the table.
+    stratify_by: str, default None
+        Column to control for (e.g. 'family').
+    processes: int, default None
+        Number of processes.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Headers: 'feature1', 'feature2', 'languages', 'chi2', 'cramers_v'.
+    """
+    df = _get_df(df)
+    columns = _feature_columns(df, features)
+    names = [column[1:-len('_num')] for column in columns]
+    factorized = [_factorize(df[column]) for column in columns]
+    codes = numpy.column_stack(
+        [codes for codes, uniques in factorized]
+    ) if columns else numpy.zeros((len(df), 0), dtype=numpy.int64)
+    sizes = numpy.array([len(uniques) for codes, uniques in factorized])
+    strata = None
+    if stratify_by is not None:
+        strata, uniques = _factorize(df[stratify_by])
+
+    rows = range(len(columns) - 1)
+    if processes is not None and processes > 1:
+        # The arrays are sent to each process once, and each process
+        # gets one chunk of features
+        chunks = [rows[start::processes] for start in range(processes)]
+        with concurrent.futures.ProcessPoolExecutor(
+            processes, initializer=_init,
+            initargs=(codes, sizes, strata)
+        ) as executor:
+            by_chunk = list(executor.map(_statistics_chunk, chunks))
+        results = [None] * len(rows)
+        for chunk, chunk_results in zip(chunks, by_chunk):
+            for i, result in zip(chunk, chunk_results):
+                results[i] = result
+    else:
+        _init(codes, sizes, strata)
+        try:
+            results = [_statistics(i) for i in rows]
+        finally:
+            _shared.clear()
+
+    pairs = [
+        (names[i], names[j]) for i in rows for j in range(i + 1, len(names))
+    ]
+    if results:
+        n, chi2, v = (numpy.concatenate(part) for part in zip(*results))
+    else:
+        n, chi2, v = [], [], []
+    return pandas.DataFrame({
+        'feature1': [pair[0] for pair in pairs],
+        'feature2': [pair[1] for pair in pairs],
+        'languages': n,
+        'chi2': chi2,
+        'cramers_v': v,
+    })
+
+
+def cramers_v(df, features=None, stratify_by=None, processes=None):
+    """Matrix of Cramér's V of the features.
+
+    Parameters are the same as of ``get_associations``.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Index and headers: features. The diagonal is 1.
+    """
+    df = _get_df(df)
+    associations = get_associations(df, features, stratify_by, processes)
+    names = [
+        column[1:-len('_num')] for column in _feature_columns(df, features)
+    ]
+    names = pandas.Index(names)
+    values = numpy.eye(len(names))
+    rows = names.get_indexer(associations.feature1)
+    cols = names.get_indexer(associations.feature2)
+    values[rows, cols] = associations.cramers_v.to_numpy()
+    values[cols, rows] = associations.cramers_v.to_numpy()
+    return pandas.DataFrame(values, index=names, columns=names)
@@ -12,6 +12,22 @@ Universal Attributes
 *   **features_list** or **subsets_list** *list* of str
         List of available features for all the databases except for Phoible.
         In the case of Phoible it is list of available subsets (UPSID, SPA etc.).
+*   **cache_size** (*int*, default *8*)
+        How many resulting tables ``get_df`` keeps for different parameters.
+        Calling ``get_df`` with the same parameters returns the memoized table
+        (the citation is printed only when the table is built). The tables are
+        forgotten when features (tables, subset) of the object change or
+        ``clear_cache`` is called. Set it to 0 to disable memoization.
+        The returned table is a shallow copy: columns can be added or replaced,
+        but before pandas 3 (without Copy-on-Write) values must not be changed
+        in place.
+*   **coordinates_dtype** (*str*, default *'float64'*)
+        Dtype of ``latitude`` and ``longitude`` columns (Wals, Sails and aggregated Phoible).
+        Set it to ``'float32'`` to make them twice smaller.
+*   **coordinates_tuple** (*bool*, default *True*)
+        Whether to add ``coordinates`` column with (latitude, longitude) tuples
+        (Wals, Sails and aggregated Phoible). It is convenient for
+        ``LingMap.add_custom_coordinates`` but it takes a lot of memory.
 
 Universal Methods
 -----------------
@@ -23,18 +39,107 @@ Universal Methods
 
     In the case of Autotyp and Phoible it has optional list parameter ``strip_na``. It is a list of columns. If this parameter is given, the rows where some values in the given columns are not present will be dropped. Default: ``[]``.
 
+    In the case of Autotyp, Sails and Phoible it has optional str parameter ``na_mode``: the way missing values are represented. If the value is ``sentinel``, they are replaced with ``'~N/A~'`` string (it turns numeric columns with missing values into columns of Python objects). If the value is ``nullable``, missing values are kept as ``pandas.NA`` and the columns get pandas nullable dtypes (``Int64``, ``Float64``, ``string``, ``category``). Default: ``sentinel``.
+
     Returns the dataset as pandas.DataFrame.
 
 *   **get_json**
     
     It works the same way as get_df but it returns dict object where keys are headers of the table.
 
+*   **iter_batches**, **iter_rows**
+
+    They take parameter ``chunksize`` (default: 1000) and the same parameters as get_df.
+    ``iter_batches`` yields the table as pandas.DataFrame objects of about ``chunksize``
+    rows. The batches are built straight from the parsed source tables (WALS pages, the
+    first Autotyp table, AfBo and PHOIBLE tables, pivoted SAILS values), so the whole
+    table is never built. ``iter_rows`` yields rows as dicts.
+
+*   **to_ndjson**, **iter_ndjson**, **to_json**, **to_parquet**, **to_feather**
+
+    They export the same table as get_df without building a dict of lists.
+    The first parameter of ``to_*`` methods is path or file-like object opened
+    in text mode (e.g. ``socket.makefile('w')``). Other keyword parameters are
+    passed to get_df.
+    ``to_ndjson`` and ``iter_ndjson`` write (yield) the table as newline-delimited
+    JSON by chunks of ``chunksize`` rows. ``to_json`` writes the same object as
+    get_json returns column by column. ``to_parquet`` and ``to_feather`` (Arrow IPC)
+    require ``pyarrow``.
+
+HTTP Session
+------------
+All the datasets download data using one ``requests.Session``. It keeps connections alive,
+limits the amount of connections per host, retries failed requests with exponential backoff
+and transparently decompresses gzipped responses. Use ``set_session`` to change its
+parameters or to pass your own session. URLs of the databases are stored in
+``lingtypology.datasets.urls`` dictionary, so it is possible to point them to a mirror
+(or to a local server in tests).
+
+Large files (non-aggregated PHOIBLE table, AfBo and SAILS archives) are downloaded by
+parts in parallel if the server supports Range requests. Downloaded parts are kept in
+a partial file, so an interrupted download is resumed rather than restarted. Before the
+file is parsed its SHA-256 is checked against ``lingtypology.datasets.checksums[url]``
+(if given) or the Digest header of the server.
+
+Cache
+-----
+``set_cache_directory`` (default directory: ``~/.lingtypology_data/cache``) makes the
+datasets keep downloaded files and parsed snapshots of them on disk. Cached files are
+revalidated with conditional requests (If-None-Match/If-Modified-Since), and a file is
+parsed again only if its contents changed. ``get_manifest`` shows ETag, Last-Modified,
+SHA-256 and update time of each file. Method **refresh** of every dataset revalidates
+its files (WALS pages, Autotyp tables, archives), reloads only the changed ones and
+returns their URLs. Parsed tables are stored as Parquet if ``pyarrow`` is installed and
+pickled otherwise. Loading a pickle can execute code, so the cache directory must not be
+writable by other users.
+
+The cache can be filled beforehand by ``lingtypology-fetch`` command. If
+``LINGTYPOLOGY_CACHE`` environment variable is set, the cache is set on import
+(with ``LINGTYPOLOGY_OFFLINE`` set cached files are used without any network I/O).
+
+Asynchronous API
+----------------
+Every dataset has coroutine methods ``aget_df`` and ``aget_json`` that work like
+``get_df`` and ``get_json`` but do not block the event loop, so several datasets can
+be retrieved concurrently with ``asyncio.gather``. AfBo, Sails and Phoible download
+data on initialization; use ``await Sails.acreate(...)`` (or ``Sails(..., download=False)``
+and then ``await sails.aload()``) to do it asynchronously. If ``aiohttp`` is installed,
+pass your ``aiohttp.ClientSession`` to ``set_async_session``; otherwise downloads run
+in the default executor using the shared HTTP session.
+
+Joining datasets
+----------------
+``lingtypology.datasets.join`` aligns tables of different datasets (or the dataset
+objects themselves) by Glottocode and returns one wide table. Glottocodes are taken
+from the tables if they have them (Autotyp, Sails, Phoible), otherwise ISO 639-3 codes
+(full PHOIBLE table) and then language names (Wals, AfBo recipient languages) are
+resolved using Glottolog.
+
+Coverage matrix
+---------------
+``lingtypology.datasets.Coverage`` records which language (Glottocode) has a value for
+which feature of which dataset in a bitmap (one bit per cell). It is filled
+incrementally with ``add`` (tables or dataset objects, whose ``get_df`` results are
+memoized) and allows to select languages that have enough of the given features without
+building a wide table full of ``'~N/A~'``.
+
+CLDF datasets
+-------------
+``lingtypology.datasets.CLDF`` reads any CLDF structure dataset (``languages.csv``,
+``parameters.csv``, ``values.csv``) from a ZIP archive or a directory. Language,
+parameter and value columns of the values table are stored as integer codes
+(categorical columns), and ``CLDF.pivot`` builds the table of the requested
+parameters with numpy indexing. Sails is based on it.
+
 Classes
 -------
 """
+import numpy
 import pandas
 import requests
-import urllib.error
+import requests.adapters
+import urllib3.util.retry
+import asyncio
 import lingtypology.glottolog
 import warnings
 import json
@@ -44,10 +149,1081 @@ import io
 import zipfile
 import functools
 import datetime
+import inspect
+import collections
+import collections.abc
+import hashlib
+import pickle
+import pathlib
+import threading
+import tempfile
+import base64
+import concurrent.futures
 
 module_directory = os.path.dirname(os.path.realpath(__file__))
+_coordinate_columns = ('latitude', 'longitude')
+
+urls = {
+    'wals': 'http://wals.info/feature/{}.tab',
+    'autotyp': 'https://raw.githubusercontent.com/autotyp/' \
+        'autotyp-data/master/data/{}.csv',
+    'autotyp_tables': 'https://github.com/autotyp/autotyp-data/tree/master/data',
+    'afbo': 'https://cdstar.shh.mpg.de/bitstreams/' \
+        'EAEA0-59C8-38F2-28DC-0/afbo_pair.csv.zip',
+    'sails': 'https://cdstar.shh.mpg.de/bitstreams/' \
+        'EAEA0-0A75-A1F1-F344-0/SAILS_dataset.cldf.zip',
+    'phoible_inventories': 'https://phoible.org/inventories.csv',
+    'phoible_languages': 'https://phoible.org/languages.csv',
+    'phoible': 'https://raw.githubusercontent.com' \
+        '/phoible/dev/master/data/phoible.csv',
+}
+_session = None
+_async_session = None
+_timeout = 30
+_retries = 3
+_backoff_factor = 0.5
+_retry_statuses = (429, 500, 502, 503, 504)
+_range_threshold = 16 * 2 ** 20
+_range_chunk_size = 4 * 2 ** 20
+_range_workers = 4
+checksums = {}
+_cache_directory = None
+_offline = False
+_manifest = {}
+_snapshots = {}
+_manifest_lock = threading.Lock()
+
+
+def set_session(session=None, timeout=30, retries=3, backoff_factor=0.5,
+                max_connections_per_host=10, range_threshold=16 * 2 ** 20,
+                range_chunk_size=4 * 2 ** 20, range_workers=4):
+    """Set the HTTP session used by all the datasets.
+
+    Parameters
+    ----------
+    session: requests.Session, default None
+        Session to use. If None, a new session is created with
+        the parameters below.
+    timeout: float, default 30
+        Timeout (in seconds) for each request.
+    retries: int, default 3
+        How many times to retry a failed request.
+    backoff_factor: float, default 0.5
+        Retries are made after backoff_factor * 2 ** (retry - 1) seconds.
+    max_connections_per_host: int, default 10
+        Size of the connection pool for each host.
+    range_threshold: int, default 16 MiB
+        Large files (PHOIBLE table, AfBo and SAILS archives) of at least
+        this size are downloaded by parts in parallel if the server
+        supports Range requests.
+    range_chunk_size: int, default 4 MiB
+        Size of the parts.
+    range_workers: int, default 4
+        How many parts are downloaded at once.
+
+    Returns
+    -------
+    requests.Session
+    """
+    global _session, _timeout, _retries, _backoff_factor
+    global _range_threshold, _range_chunk_size, _range_workers
+    if session is None:
+        retry = urllib3.util.retry.Retry(
+            total=retries, backoff_factor=backoff_factor,
+            status_forcelist=_retry_statuses,
+            raise_on_status=False
+        )
+        adapter = requests.adapters.HTTPAdapter(
+            pool_maxsize=max_connections_per_host,
+            pool_block=True, max_retries=retry
+        )
+        session = requests.Session()
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+    _session = session
+    _timeout = timeout
+    _retries = retries
+    _backoff_factor = backoff_factor
+    _range_threshold = range_threshold
+    _range_chunk_size = range_chunk_size
+    _range_workers = range_workers
+    return session
+
+
+def set_async_session(session):
+    """Set aiohttp session used by asynchronous methods of the datasets.
+
+    Timeout and retries are the same as for the HTTP session
+    (see ``set_session``).
+
+    Parameters
+    ----------
+    session: aiohttp.ClientSession or None
+        If None, asynchronous methods download data in the default executor
+        using the shared HTTP session.
+    """
+    global _async_session
+    _async_session = session
+
+
+def get_session():
+    """Get the HTTP session used by all the datasets.
+
+    Returns
+    -------
+    requests.Session
+    """
+    if _session is None:
+        set_session()
+    return _session
+
+
+def set_cache_directory(directory=os.path.join(
+        str(pathlib.Path.home()), '.lingtypology_data', 'cache'), offline=False):
+    """Keep downloaded files and parsed snapshots on disk.
+
+    Downloaded files are revalidated with conditional requests
+    (If-None-Match/If-Modified-Since), so unchanged files are not downloaded
+    again. Parsed tables are stored next to them and are reused while the file
+    does not change. The manifest (``manifest.json``) records ETag,
+    Last-Modified and SHA-256 of each file.
+
+    The cache is also set on import if ``LINGTYPOLOGY_CACHE`` environment
+    variable is set (offline if ``LINGTYPOLOGY_OFFLINE`` is set too).
+
+    Parsed tables are stored as Parquet if pyarrow is installed, other
+    snapshots (and tables without pyarrow) are pickled. Loading a pickle
+    can execute arbitrary code, so the directory must be trusted: do not
+    point it to a location other users can write to.
+
+    Parameters
+    ----------
+    directory: str, default '~/.lingtypology_data/cache'
+        If None, the cache is disabled (default before this function is called).
+    offline: bool, default False
+        If True, cached files are used without revalidation and files that
+        are not cached raise requests.ConnectionError (e.g. when the cache
+        is filled by ``lingtypology-fetch`` beforehand).
+    """
+    global _cache_directory, _manifest, _offline
+    with _manifest_lock:
+        _cache_directory = directory
+        _offline = offline and directory is not None
+        _manifest = {}
+        _snapshots.clear()
+        if directory is None:
+            return
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, 'manifest.json')
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                _manifest = json.load(f)
+
+
+def get_manifest():
+    """Get versions of the cached files.
+
+    Returns
+    -------
+    dict
+        Keys: URLs. Values: dicts with keys 'etag', 'last_modified', 'sha256',
+        'updated' (when the file last changed) and 'checked'
+        (when it was last revalidated).
+    """
+    with _manifest_lock:
+        return json.loads(json.dumps(_manifest))
+
+
+def _cache_path(url, extension):
+    """Path of the cached file for the URL"""
+    name = hashlib.sha1(url.encode('utf-8')).hexdigest() + extension
+    return os.path.join(_cache_directory, name)
+
+
+def _write_atomically(path, content):
+    """Write the file so that readers never see it half-written.
+
+    The temporary file has a unique name (process ID and a random suffix),
+    so several threads or processes (e.g. ``lingtypology-fetch`` and a job)
+    can share the cache. Unlike tempfile, it gets the usual permissions.
+    """
+    temporary = '{}.{}.{}.tmp'.format(path, os.getpid(), os.urandom(8).hex())
+    try:
+        with open(temporary, 'xb') as f:
+            f.write(content)
+        os.replace(temporary, path)
+    except OSError:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+        raise
+
+
+def _save_manifest():
+    """Write the manifest. Call it with _manifest_lock acquired."""
+    _write_atomically(
+        os.path.join(_cache_directory, 'manifest.json'),
+        json.dumps(_manifest, indent=1, sort_keys=True).encode('utf-8')
+    )
+
+
+def _fetch_cached(url):
+    """Download the URL unless the cached copy is still valid.
+
+    Returns
+    -------
+    tuple
+        Contents (bytes) and whether they changed since the last download.
+    """
+    path = _cache_path(url, '.data')
+    entry = _manifest.get(url)
+    if _offline:
+        if entry is None or not os.path.exists(path):
+            raise requests.ConnectionError(
+                '{} is not cached (offline mode)'.format(url)
+            )
+        with open(path, 'rb') as f:
+            return f.read(), False
+    headers = {}
+    if entry is not None and os.path.exists(path):
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+    response = get_session().get(url, headers=headers, timeout=_timeout)
+    if response.status_code == 304:
+        return _read_cached(url), False
+    response.raise_for_status()
+    content = response.content
+    return content, _store_cached(url, content, response.headers)
+
+
+def _read_cached(url, headers=None):
+    """Read the cached file that is still valid.
+
+    If headers are given, the checksum of the file is verified
+    (see ``_verify``) and the manifest entry is marked as verified.
+    """
+    with open(_cache_path(url, '.data'), 'rb') as f:
+        content = f.read()
+    if headers is not None:
+        _verify(url, content, headers)
+    with _manifest_lock:
+        _manifest[url]['checked'] = datetime.datetime.now().isoformat()
+        if headers is not None:
+            _manifest[url]['verified'] = True
+        _save_manifest()
+    return content
+
+
+def _store_cached(url, content, headers, verified=False):
+    """Store the downloaded file in the cache.
+
+    Returns
+    -------
+    bool
+        Whether the contents changed.
+    """
+    now = datetime.datetime.now().isoformat()
+    entry = _manifest.get(url)
+    digest = hashlib.sha256(content).hexdigest()
+    changed = entry is None or entry.get('sha256') != digest
+    if changed:
+        _write_atomically(_cache_path(url, '.data'), content)
+    with _manifest_lock:
+        new_entry = dict(entry or {})
+        new_entry.update({
+            'etag': headers.get('ETag'),
+            'last_modified': headers.get('Last-Modified'),
+            'sha256': digest,
+            'checked': now,
+            'verified': verified,
+        })
+        if changed:
+            new_entry['updated'] = now
+        _manifest[url] = new_entry
+        _save_manifest()
+    return changed
+
+
+def _fetch_revalidated(url, revalidate=True):
+    """Download the URL using the shared session.
+
+    If the cache directory is set, the cached copy is revalidated instead
+    (small files are always revalidated).
+    Raises requests.HTTPError if the response status is not OK.
+
+    Returns
+    -------
+    tuple
+        Contents (bytes) and whether they changed since the last download.
+    """
+    if _cache_directory is not None:
+        return _fetch_cached(url)
+    response = get_session().get(url, timeout=_timeout)
+    response.raise_for_status()
+    return response.content, True
+
+
+def _fetch(url):
+    """Download the URL (see ``_fetch_revalidated``).
+
+    Returns
+    -------
+    bytes
+    """
+    return _fetch_revalidated(url)[0]
+
+
+def _expected_digest(url, headers):
+    """SHA-256 (hex) the file should have or None.
+
+    It is taken from ``checksums`` dictionary or from Digest/Repr-Digest
+    header of the response.
+    """
+    if url in checksums:
+        return checksums[url].lower()
+    for header in ('Repr-Digest', 'Digest'):
+        match = re.search(
+            r'sha-256=:?([A-Za-z0-9+/=]+):?', headers.get(header, ''), re.I
+        )
+        if match:
+            return base64.b64decode(match.group(1)).hex()
+
+
+def _verify(url, content, headers):
+    """Raise ValueError if the checksum of the downloaded file is wrong"""
+    expected = _expected_digest(url, headers)
+    if expected is not None \
+        and hashlib.sha256(content).hexdigest() != expected:
+        raise ValueError('Checksum mismatch for ' + url)
+
+
+def _download_ranges(url, size, validator):
+    """Download the file by parts in parallel.
+
+    Downloaded parts are written to a partial file (in the cache directory
+    if it is set, otherwise in the temporary directory). If the download is
+    interrupted, the next one downloads only the missing parts.
+    """
+    directory = _cache_directory or \
+        os.path.join(tempfile.gettempdir(), 'lingtypology')
+    os.makedirs(directory, exist_ok=True)
+    name = hashlib.sha1(url.encode('utf-8')).hexdigest()
+    partial = os.path.join(directory, name + '.part')
+    state_path = partial + '.json'
+    state = {'size': size, 'validator': validator, 'done': []}
+    if os.path.exists(state_path) and os.path.exists(partial):
+        with open(state_path, encoding='utf-8') as f:
+            saved = json.load(f)
+        if saved['size'] == size and saved['validator'] == validator:
+            state = saved
+    if not state['done']:
+        with open(partial, 'wb') as f:
+            f.truncate(size)
+    done = set(state['done'])
+    lock = threading.Lock()
+    changed = []
+
+    def download(start):
+        end = min(start + _range_chunk_size, size) - 1
+        headers = {'Range': 'bytes={}-{}'.format(start, end)}
+        if validator:
+            headers['If-Range'] = validator
+        response = get_session().get(url, headers=headers, timeout=_timeout)
+        response.raise_for_status()
+        if response.status_code != 206:
+            #The file has changed since the download started:
+            #the downloaded parts are useless
+            with lock:
+                changed.append(start)
+                for path in (state_path, partial):
+                    if os.path.exists(path):
+                        os.remove(path)
+        if len(response.content) != end - start + 1 and not changed:
+            raise requests.HTTPError('Incomplete part of ' + url)
+        with lock:
+            if changed:
+                raise requests.HTTPError(
+                    '{} changed during download'.format(url)
+                )
+            with open(partial, 'r+b') as f:
+                f.seek(start)
+                f.write(response.content)
+            done.add(start)
+            state['done'] = sorted(done)
+            with open(state_path, 'w', encoding='utf-8') as f:
+                json.dump(state, f)
+
+    starts = [
+        start for start in range(0, size, _range_chunk_size) \
+            if start not in done
+    ]
+    with concurrent.futures.ThreadPoolExecutor(_range_workers) as executor:
+        list(executor.map(download, starts))
+    with open(partial, 'rb') as f:
+        content = f.read()
+    os.remove(partial)
+    os.remove(state_path)
+    return content
+
+
+def _fetch_verified(url, revalidate=False):
+    """Download a large file verifying its checksum.
+
+    If the server supports Range requests and the file is at least
+    ``range_threshold`` bytes, it is downloaded by parts in parallel and the
+    download can be resumed. The checksum is verified before the contents
+    are cached or returned.
+
+    If the cache directory is set, the verified cached copy is used without
+    any request. With ``revalidate`` a conditional HEAD request is sent
+    first and the file is downloaded again only if it changed.
+
+    Returns
+    -------
+    tuple
+        Contents (bytes) and whether they changed since the last download.
+    """
+    if _offline:
+        return _fetch_cached(url)
+    entry = {}
+    if _cache_directory is not None \
+        and os.path.exists(_cache_path(url, '.data')):
+        entry = _manifest.get(url, {})
+    if entry.get('verified') and not revalidate:
+        return _read_cached(url, {}), False
+    headers = {}
+    if entry.get('etag'):
+        headers['If-None-Match'] = entry['etag']
+    if entry.get('last_modified'):
+        headers['If-Modified-Since'] = entry['last_modified']
+    head = get_session().head(
+        url, headers=headers, allow_redirects=True, timeout=_timeout
+    )
+    if entry and head.status_code == 304:
+        return _read_cached(url, {}), False
+    size = int(head.headers.get('Content-Length') or 0)
+    validator = head.headers.get('ETag') or head.headers.get('Last-Modified')
+    if entry and head.ok and validator \
+        and validator in (entry.get('etag'), entry.get('last_modified')):
+        return _read_cached(url, head.headers), False
+    if not head.ok or head.headers.get('Accept-Ranges') != 'bytes' \
+        or size < _range_threshold:
+        #Not through _fetch: nothing is cached before it is verified
+        response = get_session().get(url, timeout=_timeout)
+        response.raise_for_status()
+        content = response.content
+        headers = response.headers
+    else:
+        content = _download_ranges(url, size, validator)
+        headers = head.headers
+    _verify(url, content, headers)
+    if _cache_directory is None:
+        return content, True
+    return content, _store_cached(url, content, headers, verified=True)
+
+
+def _fetch_large(url):
+    """Download a large file (see ``_fetch_verified``).
+
+    Returns
+    -------
+    bytes
+    """
+    return _fetch_verified(url)[0]
+
+
+async def _afetch_large(url):
+    """Asynchronous _fetch_large (runs in the default executor)."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, _fetch_large, url)
+
+
+def _dump_snapshot(parsed):
+    """Serialize the parsed object.
+
+    Tables are stored as Parquet if pyarrow is installed (loading them
+    does not execute any code), other objects are pickled.
+
+    Returns
+    -------
+    tuple
+        Format ('parquet' or 'pickle') and the contents.
+    """
+    if isinstance(parsed, pandas.DataFrame):
+        try:
+            import pyarrow
+        except ImportError:
+            pass
+        else:
+            buffer = io.BytesIO()
+            try:
+                parsed.to_parquet(buffer, engine='pyarrow')
+            except (pyarrow.ArrowException, ValueError, TypeError):
+                #Columns of mixed types are pickled
+                pass
+            else:
+                return 'parquet', buffer.getvalue()
+    return 'pickle', pickle.dumps(parsed)
+
+
+def _load_snapshot(path, snapshot_format):
+    """Load the snapshot written by _dump_snapshot"""
+    if snapshot_format == 'parquet':
+        return pandas.read_parquet(path, engine='pyarrow')
+    with open(path, 'rb') as f:
+        return pickle.load(f)
+
+
+def _parse(url, content, parse):
+    """Parse the downloaded contents reusing the snapshot of the same version.
+
+    Snapshots are kept only if the cache directory is set (see
+    ``_dump_snapshot`` for their format). Parsed objects are shared,
+    so they must not be modified.
+
+    Parameters
+    ----------
+    url: str
+        URL the contents were downloaded from.
+    content: bytes or str
+        Downloaded contents.
+    parse: callable
+        Function that parses the contents.
+    """
+    if _cache_directory is None:
+        return parse(content)
+    raw = content.encode('utf-8') if isinstance(content, str) else content
+    digest = hashlib.sha256(raw).hexdigest()
+    snapshot = _snapshots.get(url)
+    if snapshot is not None and snapshot[0] == digest:
+        return snapshot[1]
+    entry = _manifest.get(url, {})
+    snapshot_format = entry.get('snapshot_format', 'pickle')
+    path = _cache_path(url, '.' + snapshot_format)
+    if entry.get('snapshot') == digest and os.path.exists(path):
+        parsed = _load_snapshot(path, snapshot_format)
+    else:
+        parsed = parse(content)
+        new_format, dumped = _dump_snapshot(parsed)
+        _write_atomically(_cache_path(url, '.' + new_format), dumped)
+        if new_format != snapshot_format and os.path.exists(path):
+            os.remove(path)
+        snapshot_format = new_format
+        with _manifest_lock:
+            _manifest.setdefault(url, {}).update(
+                snapshot=digest, snapshot_format=snapshot_format
+            )
+            _save_manifest()
+    _snapshots[url] = (digest, parsed)
+    return parsed
+
+
+if os.environ.get('LINGTYPOLOGY_CACHE'):
+    set_cache_directory(
+        os.environ['LINGTYPOLOGY_CACHE'],
+        offline=bool(os.environ.get('LINGTYPOLOGY_OFFLINE'))
+    )
+
+
+async def _afetch(url):
+    """Download the URL without blocking the event loop.
+
+    Raises requests.HTTPError if the response status is not OK.
+
+    Returns
+    -------
+    bytes
+    """
+    if _async_session is None or _cache_directory is not None:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, _fetch, url)
+    import aiohttp
+    for attempt in range(_retries + 1):
+        try:
+            async with _async_session.get(
+                url, timeout=aiohttp.ClientTimeout(total=_timeout)
+            ) as response:
+                if response.status not in _retry_statuses \
+                    or attempt == _retries:
+                    if response.status >= 400:
+                        raise requests.HTTPError(
+                            '{} Error for url: {}'.format(response.status, url)
+                        )
+                    return await response.read()
+        except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+            if attempt == _retries:
+                raise
+        await asyncio.sleep(_backoff_factor * 2 ** attempt)
+
+
+def _fetch_or_warn(url, message):
+    """Download the URL; warn and return None if it is not found."""
+    try:
+        return _fetch(url)
+    except requests.HTTPError:
+        warnings.warn(message)
+
+
+async def _afetch_or_warn(url, message):
+    """Asynchronous _fetch_or_warn."""
+    try:
+        return await _afetch(url)
+    except requests.HTTPError:
+        warnings.warn(message)
+
+
+def _read_csv(content):
+    """Parse the downloaded CSV file"""
+    return pandas.read_csv(io.BytesIO(content), low_memory=False)
+
+
+def _fill_na(df, na_mode='sentinel'):
+    """Represent missing values in the resulting table.
+
+    Parameters
+    ----------
+    df: pandas.DataFrame
+        Table with missing values.
+    na_mode: str, default 'sentinel'
+        If 'sentinel', missing values are replaced with '~N/A~'.
+        If 'nullable', columns are converted to pandas nullable dtypes.
+        String columns with repeating values become categorical.
+        Latitude and longitude always stay float.
+
+    Returns
+    -------
+    pandas.DataFrame
+    """
+    coordinates = [c for c in _coordinate_columns if c in df]
+    if na_mode == 'sentinel':
+        return df.fillna({
+            column: '~N/A~' for column in df if column not in coordinates
+        })
+    elif na_mode == 'nullable':
+        converted = df.convert_dtypes()
+        for column in coordinates:
+            converted[column] = \
+                df[column].convert_dtypes(convert_integer=False)
+        for column in converted.select_dtypes(include='string'):
+            if converted[column].nunique() < len(converted) // 2:
+                converted[column] = converted[column].astype('category')
+        return converted
+    raise ValueError(
+        'Unknown na_mode {}. Use either "sentinel" ' \
+        'or "nullable"'.format(na_mode)
+    )
+
+
+def _strip_na(df, columns, na_mode='sentinel'):
+    """Drop rows where values in any of the given columns are missing.
+
+    The mask is computed for all the columns at once.
+    """
+    if not columns:
+        return df
+    values = df[list(columns)]
+    if na_mode == 'nullable':
+        mask = values.notna().all(axis=1)
+    else:
+        mask = (values != '~N/A~').all(axis=1)
+    return df[mask]
+
+
+def _format_coordinates(df, dtype='float64', as_tuple=True):
+    """Cast latitude and longitude columns and add coordinates column.
+
+    Parameters
+    ----------
+    df: pandas.DataFrame
+        Table with 'latitude' and 'longitude' columns.
+    dtype: str, default 'float64'
+        Dtype of the latitude and longitude columns.
+    as_tuple: bool, default True
+        Whether to insert 'coordinates' column of (latitude, longitude)
+        tuples before latitude.
+
+    Returns
+    -------
+    pandas.DataFrame
+    """
+    df = df.copy()
+    if as_tuple:
+        df.insert(
+            df.columns.get_loc('latitude'), 'coordinates',
+            list(zip(df.latitude.tolist(), df.longitude.tolist()))
+        )
+    return df.astype({'latitude': dtype, 'longitude': dtype})
+
+
+def _freeze(value):
+    """Make the parameter value hashable.
+
+    Strings are kept as is, sets become frozensets, dicts frozensets
+    of items and other iterables (lists, numpy arrays, pandas indices)
+    tuples.
+    """
+    if isinstance(value, (str, bytes)):
+        return value
+    if isinstance(value, (set, frozenset)):
+        return frozenset(_freeze(v) for v in value)
+    if isinstance(value, dict):
+        return frozenset((k, _freeze(v)) for k, v in value.items())
+    if isinstance(value, collections.abc.Iterable):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def _shared_copy(df):
+    """Shallow copy of the memoized table.
+
+    Columns can be added, replaced or dropped without changing the
+    memoized table, but values must not be changed in place (unless
+    Copy-on-Write is enabled, as it is in pandas 3).
+    """
+    return df.copy(deep=False)
+
+
+#Guards memoized tables of all the datasets: aget_df calls get_df
+#in executor threads
+_memo_lock = threading.RLock()
+
+
+def _memoized(method):
+    """Memoize tables returned by get_df-like method (or coroutine).
+
+    The key is made of the method parameters. Tables depending on
+    other attributes are dropped when ``_cache_state`` changes.
+    Calls with parameters that cannot be hashed are not memoized.
+    """
+    signature = inspect.signature(method)
+
+    def make_key(self, args, kwargs):
+        bound = signature.bind(self, *args, **kwargs)
+        bound.apply_defaults()
+        try:
+            key = tuple(
+                (name, _freeze(value)) \
+                    for name, value in list(bound.arguments.items())[1:]
+            )
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
+    def shared(df):
+        return df if df is None else _shared_copy(df)
+
+    if asyncio.iscoroutinefunction(method):
+        @functools.wraps(method)
+        async def wrapper(self, *args, **kwargs):
+            key = make_key(self, args, kwargs)
+            if key is None:
+                return await method(self, *args, **kwargs)
+            df = self._cache_get(key)
+            if df is None:
+                df = await method(self, *args, **kwargs)
+                self._cache_put(key, df)
+            return shared(df)
+    else:
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            key = make_key(self, args, kwargs)
+            if key is None:
+                return method(self, *args, **kwargs)
+            df = self._cache_get(key)
+            if df is None:
+                df = method(self, *args, **kwargs)
+                self._cache_put(key, df)
+            return shared(df)
+    return wrapper
+
+
+def _df_to_dict(df, na_mode='sentinel'):
+    """Convert the table to dict where keys are headers.
+
+    In 'nullable' mode missing values are converted to None.
+    """
+    if na_mode == 'nullable':
+        df = df.astype(object).where(df.notna(), None)
+    return {header: list(df[header]) for header in list(df)}
+
+
+class _Dataset(object):
+    """Methods shared by all the datasets.
+
+    Keyword arguments of export and asynchronous methods are passed to ``get_df``.
+    """
+    _loaded = True
+    cache_size = 8
+    #Downloads the files of the dataset both on load and on refresh:
+    #(url, revalidate) -> (contents, whether they changed)
+    _fetch_source = staticmethod(_fetch_revalidated)
+
+    def _cache_state(self):
+        """Attributes (except for get_df parameters) the table depends on"""
+        return ()
+
+    def clear_cache(self):
+        """Forget memoized tables."""
+        with _memo_lock:
+            self._df_cache = collections.OrderedDict()
+            self._df_cache_state = self._cache_state()
+
+    def _cache_get(self, key):
+        """Get memoized table or None"""
+        with _memo_lock:
+            if not hasattr(self, '_df_cache') \
+                or self._df_cache_state != self._cache_state():
+                self.clear_cache()
+            df = self._df_cache.get(key)
+            if df is not None:
+                self._df_cache.move_to_end(key)
+            return df
+
+    def _cache_put(self, key, df):
+        """Memoize the table evicting the least recently used ones"""
+        if df is None or self.cache_size <= 0:
+            return
+        with _memo_lock:
+            self._df_cache[key] = df
+            while len(self._df_cache) > self.cache_size:
+                self._df_cache.popitem(last=False)
+
+    def load(self):
+        """Download the data if the dataset downloads it on initialization.
+
+        Returns
+        -------
+        self
+        """
+        return self
+
+    def _source_urls(self):
+        """URLs of the files the dataset is built from"""
+        return []
+
+    def refresh(self):
+        """Revalidate the downloaded files.
+
+        If the cache directory is set (see ``set_cache_directory``),
+        conditional requests are sent and only the files that changed are
+        downloaded and parsed again (by the same function ``load`` uses,
+        so they are cached the same way). Otherwise all the files are
+        considered changed. Memoized tables are forgotten if something
+        changed.
+        Checksums of large files (AfBo and SAILS archives, PHOIBLE tables)
+        are verified: ValueError is raised if a new file is corrupted.
+
+        Returns
+        -------
+        list of str
+            URLs of the files that changed.
+        """
+        if _cache_directory is None:
+            changed = list(self._source_urls())
+        else:
+            changed = []
+            for url in self._source_urls():
+                try:
+                    if self._fetch_source(url, revalidate=True)[1]:
+                        changed.append(url)
+                except requests.HTTPError:
+                    pass
+        if changed:
+            if self._loaded:
+                self.load()
+            self.clear_cache()
+        return changed
+
+    async def aload(self):
+        """Asynchronous ``load``.
+
+        Returns
+        -------
+        self
+        """
+        return self
+
+    @classmethod
+    async def acreate(cls, *args, **kwargs):
+        """Create the dataset downloading its data asynchronously.
+
+        Parameters are the same as for the class.
+        """
+        if 'download' in inspect.signature(cls).parameters:
+            kwargs['download'] = False
+        return await cls(*args, **kwargs).aload()
+
+    async def aget_df(self, **kwargs):
+        """Asynchronous ``get_df``.
+
+        Downloads the data first if it has not been downloaded yet.
+        The table is built in the default executor, so the event loop
+        is not blocked while the data is parsed.
+        """
+        if not self._loaded:
+            await self.aload()
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            None, functools.partial(self.get_df, **kwargs)
+        )
+
+    async def aget_json(self, **kwargs):
+        """Asynchronous ``get_json``."""
+        df = await self.aget_df(**kwargs)
+        return _df_to_dict(df, kwargs.get('na_mode', 'sentinel'))
+
+    def _write(self, path_or_buf, chunks):
+        """Write strings to the path or to the file-like object."""
+        if hasattr(path_or_buf, 'write'):
+            for chunk in chunks:
+                path_or_buf.write(chunk)
+        else:
+            with open(path_or_buf, 'w', encoding='utf-8') as f:
+                for chunk in chunks:
+                    f.write(chunk)
+
+    def _get_arrow_df(self, **kwargs):
+        """Get the table in a form that Arrow is able to store.
+
+        Nullable dtypes are used if possible and the column of
+        coordinates tuples is dropped (latitude and longitude remain).
+        """
+        if 'na_mode' in inspect.signature(self.get_df).parameters:
+            kwargs.setdefault('na_mode', 'nullable')
+        df = self.get_df(**kwargs)
+        if 'latitude' in df:
+            df = df.drop(columns='coordinates', errors='ignore')
+        return df.reset_index(drop=True)
+
+    def _iter_batches(self, chunksize, **kwargs):
+        """Slice the resulting table if the dataset cannot stream it"""
+        df = self.get_df(**kwargs)
+        if df is None:
+            return
+        for start in range(0, len(df), chunksize):
+            yield df.iloc[start:start + chunksize]
+
+    def iter_batches(self, chunksize=1000, **kwargs):
+        """Iterate over the resulting table by batches.
+
+        Batches are built from the parsed source tables one by one, so the
+        whole resulting table is never built. Concatenated batches are the
+        same table as get_df returns, except that in 'nullable' na_mode
+        dtypes are inferred for each batch.
+
+        Parameters
+        ----------
+        chunksize: int, default 1000
+            Amount of source rows in one batch (rows dropped by
+            ``strip_na`` or added by joins change the size).
+        **kwargs
+            Parameters of ``get_df``.
+
+        Yields
+        ------
+        pandas.DataFrame
+        """
+        for batch in self._iter_batches(chunksize, **kwargs):
+            yield batch
+
+    def iter_rows(self, chunksize=1000, **kwargs):
+        """Iterate over rows of the resulting table.
+
+        Parameters are the same as of ``iter_batches``.
+
+        Yields
+        ------
+        dict
+            Keys are headers of the table.
+        """
+        for batch in self.iter_batches(chunksize, **kwargs):
+            for row in batch.to_dict(orient='records'):
+                yield row
+
+    def iter_ndjson(self, chunksize=1000, **kwargs):
+        """Iterate over the table as newline-delimited JSON.
+
+        Parameters
+        ----------
+        chunksize: int, default 1000
+            Amount of rows in one yielded string.
+
+        Yields
+        ------
+        str
+            Several JSON objects (one per row) separated by newlines.
+            Nothing is yielded if there is no table (e.g. no tables
+            are given).
+        """
+        for batch in self.iter_batches(chunksize, **kwargs):
+            if batch is not None and len(batch):
+                yield batch.to_json(
+                    orient='records', lines=True, force_ascii=False
+                )
+
+    def to_ndjson(self, path_or_buf, chunksize=1000, **kwargs):
+        """Write the table as newline-delimited JSON.
+
+        Parameters
+        ----------
+        path_or_buf: str or file-like object
+            Output file.
+        chunksize: int, default 1000
+            Amount of rows serialized at once.
+        """
+        self._write(
+            path_or_buf, self.iter_ndjson(chunksize=chunksize, **kwargs)
+        )
 
-class Wals(object):
+    def to_json(self, path_or_buf, **kwargs):
+        """Write the table as JSON object where keys are headers.
+
+        It is the same object as ``get_json`` returns but columns are
+        serialized one by one. If there is no table (e.g. no tables
+        are given), an empty object is written.
+
+        Parameters
+        ----------
+        path_or_buf: str or file-like object
+            Output file.
+        """
+        def columns(df):
+            yield '{'
+            if df is None:
+                df = pandas.DataFrame()
+            for i, header in enumerate(df):
+                yield '{}{}:'.format(
+                    ',' if i else '',
+                    json.dumps(str(header), ensure_ascii=False)
+                )
+                yield df[header].to_json(orient='values', force_ascii=False)
+            yield '}'
+        self._write(path_or_buf, columns(self.get_df(**kwargs)))
+
+    def to_parquet(self, path, **kwargs):
+        """Write the table to Parquet file (requires pyarrow).
+
+        Parameters
+        ----------
+        path: str or file-like object
+            Output file.
+        """
+        self._get_arrow_df(**kwargs).to_parquet(path)
+
+    def to_feather(self, path, **kwargs):
+        """Write the table to Arrow IPC (Feather) file (requires pyarrow).
+
+        Parameters
+        ----------
+        path: str or file-like object
+            Output file.
+        """
+        self._get_arrow_df(**kwargs).to_feather(path)
+
+
+class Wals(_Dataset):
     """WALS database.
     
     WALS: ’The World Atlas of Language Structures (WALS) is a large
@@ -73,7 +1249,36 @@ class Wals(object):
         ``get_df`` method is called.
     features_list: str
         List of all the WALS pages.
+    coordinates_dtype: str, default 'float64'
+        Dtype of latitude and longitude columns.
+    coordinates_tuple: bool, default True
+        Whether to add coordinates column with tuples.
     """
+    features_list = [
+        '1A', '2A', '3A', '4A', '5A', '6A', '7A', '8A', '9A', '10A',
+        '10B', '11A', '12A', '13A', '14A', '15A', '16A', '17A', '18A',
+        '19A', '20A', '21A', '21B', '22A', '23A', '24A', '25A', '25B',
+        '26A', '27A', '28A', '29A', '30A', '31A', '32A', '33A', '34A',
+        '35A', '36A', '37A', '38A', '39A', '39B', '40A', '41A', '42A', 
+        '43A', '44A', '45A', '46A', '47A', '48A', '49A', '50A', '51A',
+        '52A', '53A', '54A', '55A', '56A', '57A', '58A', '58B', '59A',
+        '60A', '61A', '62A', '63A', '64A', '65A', '66A', '67A', '68A',
+        '69A', '70A', '71A', '72A', '73A', '74A', '75A', '76A', '77A',
+        '78A', '79A', '79B', '80A', '81A', '81B', '82A', '83A', '84A',
+        '85A', '86A', '87A', '88A', '89A', '90A', '90B', '90C', '90D',
+        '90E', '90F', '90G', '91A', '92A', '93A', '94A', '95A', '96A',
+        '97A', '98A', '99A', '100A', '101A', '102A', '103A', '104A',
+        '105A', '106A', '107A', '108A', '108B', '109A', '109B', '110A',
+        '111A', '112A', '113A', '114A', '115A', '116A', '117A', '118A',
+        '119A', '120A', '121A', '122A', '123A', '124A', '125A', '126A',
+        '127A', '128A', '129A', '130A', '130B', '131A', '132A', '133A',
+        '134A', '135A', '136A', '136B', '137A', '137B', '138A', '139A',
+        '140A', '141A', '142A', '143A', '143B', '143C', '143D', '143E',
+        '143F', '143G', '144A', '144B', '144C', '144D', '144E', '144F',
+        '144G', '144H', '144I', '144J', '144K', '144L', '144M', '144N',
+        '144O', '144P', '144Q', '144R', '144S', '144T', '144U', '144V',
+        '144W', '144X', '144Y'
+    ]
 
     def __init__(self, *features):
         """init
@@ -87,93 +1292,109 @@ class Wals(object):
         """
         self.features = features
         self.show_citation = True
+        self.coordinates_dtype = 'float64'
+        self.coordinates_tuple = True
+        self._citations = {}
         self.general_citation = \
             'Dryer, Matthew S. & Haspelmath, Martin (eds.) 2013.\n' \
             'The World Atlas of Language Structures Online.\n' \
             'Leipzig: Max Planck Institute for Evolutionary Anthropology.\n' \
             '(Available online at http://wals.info, Accessed on {}.)'.format(
                 datetime.datetime.now().strftime('%Y-%m-%d'))
-        self.features_list = [
-            '1A', '2A', '3A', '4A', '5A', '6A', '7A', '8A', '9A', '10A',
-            '10B', '11A', '12A', '13A', '14A', '15A', '16A', '17A', '18A',
-            '19A', '20A', '21A', '21B', '22A', '23A', '24A', '25A', '25B',
-            '26A', '27A', '28A', '29A', '30A', '31A', '32A', '33A', '34A',
-            '35A', '36A', '37A', '38A', '39A', '39B', '40A', '41A', '42A', 
-            '43A', '44A', '45A', '46A', '47A', '48A', '49A', '50A', '51A',
-            '52A', '53A', '54A', '55A', '56A', '57A', '58A', '58B', '59A',
-            '60A', '61A', '62A', '63A', '64A', '65A', '66A', '67A', '68A',
-            '69A', '70A', '71A', '72A', '73A', '74A', '75A', '76A', '77A',
-            '78A', '79A', '79B', '80A', '81A', '81B', '82A', '83A', '84A',
-            '85A', '86A', '87A', '88A', '89A', '90A', '90B', '90C', '90D',
-            '90E', '90F', '90G', '91A', '92A', '93A', '94A', '95A', '96A',
-            '97A', '98A', '99A', '100A', '101A', '102A', '103A', '104A',
-            '105A', '106A', '107A', '108A', '108B', '109A', '109B', '110A',
-            '111A', '112A', '113A', '114A', '115A', '116A', '117A', '118A',
-            '119A', '120A', '121A', '122A', '123A', '124A', '125A', '126A',
-            '127A', '128A', '129A', '130A', '130B', '131A', '132A', '133A',
-            '134A', '135A', '136A', '136B', '137A', '137B', '138A', '139A',
-            '140A', '141A', '142A', '143A', '143B', '143C', '143D', '143E',
-            '143F', '143G', '144A', '144B', '144C', '144D', '144E', '144F',
-            '144G', '144H', '144I', '144J', '144K', '144L', '144M', '144N',
-            '144O', '144P', '144Q', '144R', '144S', '144T', '144U', '144V',
-            '144W', '144X', '144Y'
-        ]
 
-    def _get_wals_data(self, feature):
+    def _get_wals_page(self, feature):
+        """Downloads the Wals page
+
+        Parameters
+        ----------
+        feature: str
+            Name of the Wals page.
+
+        Returns
+        -------
+        str
+            Contents of the page (citation + TSV table) or None.
+        """
+        page = _fetch_or_warn(
+            urls['wals'].format(feature),
+            '(Wals) Warning: cannot read Wals feature ' + feature
+        )
+        if page is not None:
+            return page.decode('utf-8')
+
+    async def _aget_wals_page(self, feature):
+        """Asynchronous _get_wals_page"""
+        page = await _afetch_or_warn(
+            urls['wals'].format(feature),
+            '(Wals) Warning: cannot read Wals feature ' + feature
+        )
+        if page is not None:
+            return page.decode('utf-8')
+
+    def _get_wals_data(self, feature, page=None):
         """Loads data from Wals
 
         Parameters
         ----------
         feature: str
             Name of the Wals page.
+        page: str, default None
+            Contents of the page if it is already downloaded.
 
         Returns
         -------
         pandas.DataFrame
-            Headers: 'wals code', 'description'.
+            Headers: 'wals_code', 'language', 'genus', 'family',
+            'latitude', 'longitude', [[page columns]].
         """
-        wals_url = 'http://wals.info/feature/{}.tab'.format(feature)
-        try:
-            df_feature = pandas.read_csv(wals_url, delimiter='\t', skiprows=5)
-        except urllib.error.HTTPError:
-            warnings.warn(
-                '(Wals) Warning: cannot read Wals feature ' + feature
-            )
-        else:
-            df = df_feature[['wals code', 'name', 'genus', 'family', 'area',
-                             'latitude', 'longitude', 'value', 'description']]
-            final_df = pandas.DataFrame({
-                'wals_code': df['wals code'],
-                'language': df.name,
-                'genus': df.genus,
-                'family': df.family,
-                'coordinates': tuple(zip(df.latitude, df.longitude)),
-                '_{}_area'.format(feature): df.area,
-                '_' + feature: ['{num}. {desc}'.format(num=num, desc=desc) \
-                                for num, desc in zip(df.value, df.description)],
-                '_{}_num'.format(feature): df.value.astype(int),
-                '_{}_desc'.format(feature): df.description,
-            })
-            return final_df
+        if page is None:
+            page = self._get_wals_page(feature)
+        if page is None:
+            return
+        return _parse(
+            urls['wals'].format(feature), page,
+            functools.partial(self._read_wals_page, feature)
+        )
 
-    def _get_citation(self, feature):
+    @staticmethod
+    def _read_wals_page(feature, page):
+        """Parse the Wals page"""
+        df = pandas.read_csv(io.StringIO(page), delimiter='\t', skiprows=5)
+        final_df = pandas.DataFrame({
+            'wals_code': df['wals code'],
+            'language': df.name,
+            'genus': df.genus,
+            'family': df.family,
+            'latitude': df.latitude,
+            'longitude': df.longitude,
+            '_{}_area'.format(feature): df.area,
+            '_' + feature: ['{num}. {desc}'.format(num=num, desc=desc) \
+                            for num, desc in zip(df.value, df.description)],
+            '_{}_num'.format(feature): df.value.astype(int),
+            '_{}_desc'.format(feature): df.description,
+        })
+        return final_df
+
+    def _get_citation(self, feature, page=None):
         """Loads citation from Wals
 
         Parameter feature: str
             Name of the Wals page.
+        Parameter page: str, default None
+            Contents of the page if it is already downloaded.
 
         Returns str
         """
-        wals_url = 'http://wals.info/feature/{}.tab'.format(feature)
-        wals_page = requests.get(wals_url)
-        if wals_page.status_code == 404:
+        if feature in self._citations:
+            return self._citations[feature]
+        if page is None:
+            page = self._get_wals_page(feature)
+        if page is None:
             warnings.warn('No such feature in WALS')
             return
         _citation = 'Citation for feature {}:\n{}\n'
-        citation = _citation.format(
-            feature,
-            '\n'.join(wals_page.content.decode('utf-8').split('\n')[:5])
-        )
+        citation = _citation.format(feature, '\n'.join(page.split('\n')[:5]))
+        self._citations[feature] = citation
         return citation
     
     @property
@@ -184,6 +1405,14 @@ class Wals(object):
             cit += self._get_citation(feature.upper()) + '\n'
         return cit
 
+    def _cache_state(self):
+        return (tuple(self.features), self.coordinates_dtype,
+                self.coordinates_tuple)
+
+    def _source_urls(self):
+        return [urls['wals'].format(feature.upper()) for feature in self.features]
+
+    @_memoized
     def get_df(self, join_how='inner'):
         """Get data from WALS in pandas.DataFrame format.
 
@@ -191,32 +1420,96 @@ class Wals(object):
         -------
         pandas.DataFrame
             DataFrame.
-            Headers: 'wals code', 'language', 'genus',
-            'family', 'area', 'coordinates',
+            Headers: 'wals_code', 'language', 'genus',
+            'family', 'coordinates', 'latitude', 'longitude',
             [[name of the page1]], [[name of the page2]], ...
             Names of the pages start with '_'.
         """
-        features = self.features
+        pages = [
+            self._get_wals_page(feature.upper()) for feature in self.features
+        ]
+        return self._make_df(pages, join_how)
+
+    @_memoized
+    async def aget_df(self, join_how='inner'):
+        """Asynchronous ``get_df``. The pages are downloaded concurrently."""
+        pages = await asyncio.gather(*[
+            self._aget_wals_page(feature.upper()) for feature in self.features
+        ])
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            None, self._make_df, pages, join_how
+        )
+
+    def _make_df(self, pages, join_how):
+        """Merge the downloaded pages into the resulting table"""
+        languages, tables = self._read_pages(pages)
+        pages = functools.reduce(
+            lambda left, right: left.join(right, how=join_how), tables
+        )
+        return self._finish_df(languages.join(pages, how='right'))
+
+    def _iter_batches(self, chunksize, join_how='inner'):
+        pages = [
+            self._get_wals_page(feature.upper()) for feature in self.features
+        ]
+        languages, tables = self._read_pages(pages)
+        #Only WALS codes are joined, rows are taken from the pages by batches
+        codes = functools.reduce(
+            lambda left, right: left.join(right, how=join_how),
+            [table.index for table in tables]
+        )
+        for start in range(0, len(codes), chunksize):
+            batch = codes[start:start + chunksize]
+            yield self._finish_df(pandas.concat(
+                [languages.reindex(batch)] + \
+                    [table.reindex(batch) for table in tables],
+                axis=1
+            ))
+
+    def _read_pages(self, pages):
+        """Parse the pages.
+
+        Returns
+        -------
+        tuple
+            Table of languages and list of tables of the pages
+            (both indexed by WALS code).
+        """
         dataframes = []
-        for feature in features:
+        for feature, page in zip(self.features, pages):
             feature = feature.upper()
+            if page is None:
+                continue
             if self.show_citation:
-                citation = self._get_citation(feature)
-                if citation:
-                    print(citation)
-            wals_feature = self._get_wals_data(feature)
+                print(self._get_citation(feature, page))
+            wals_feature = self._get_wals_data(feature, page)
             if not wals_feature is None:
                 dataframes.append(wals_feature)
-        if len(dataframes) == 1:
-            df = dataframes[0]
-        else:
-            df = functools.reduce(lambda left, right: pandas.merge(
-                left, right, how=join_how,
-                on=['wals_code', 'language', 'genus', 'family', 'coordinates']
-            ), dataframes)
-        #df = df.reindex(['wals_code', 'language', 'genus', 'family', 'area',
-        #                 'coordinates'] + sorted(list(df.columns)[6:]), axis=1)
+        #Language info is joined separately so that pages are merged by WALS code only
+        info_columns = ['wals_code', 'language', 'genus', 'family',
+                        'latitude', 'longitude']
+        languages = pandas.concat(
+            [dataframe[info_columns] for dataframe in dataframes]
+        ).drop_duplicates('wals_code').set_index('wals_code')
+        tables = [
+            dataframe.drop(columns=info_columns[1:]).set_index('wals_code')
+                for dataframe in dataframes
+        ]
+        return languages, tables
+
+    def _finish_df(self, df):
+        """Format the table indexed by WALS code"""
+        df = df.reset_index()
         df.dropna(subset=['language'], inplace=True)
+        df = _format_coordinates(
+            df, dtype=self.coordinates_dtype, as_tuple=self.coordinates_tuple
+        )
+        df.attrs['dataset'] = 'wals'
+        df.attrs['features'] = [
+            column for column in ('_' + f.upper() for f in self.features) \
+                if column in df
+        ]
         return df
 
     def get_json(self, join_how='inner'):
@@ -226,17 +1519,33 @@ class Wals(object):
         --------
         dict
             Dictionary.
-            Keys: 'wals code', 'language', 'genus',
-            'family', 'area', 'coordinates',
+            Keys: 'wals_code', 'language', 'genus',
+            'family', 'coordinates', 'latitude', 'longitude',
             [[name of the page1]], [[name of the page2]], ...
             Names of the pages start with '_'.
         """
         df = self.get_df(join_how=join_how)
-        js = {header: list(df[header]) for header in list(df)}
-        return js
+        return _df_to_dict(df)
 
 
-class Autotyp(object):
+@functools.lru_cache(maxsize=None)
+def _autotyp_mapping():
+    """Mapping from Autotyp LID to Glottocode (read once)"""
+    with open(
+        module_directory + os.path.sep + 'autotyp_lang_mapping.json',
+        'r', encoding='utf-8'
+    ) as f:
+        return json.load(f)
+
+
+@functools.lru_cache(maxsize=None)
+def _autotyp_tables(url):
+    """Names of the Autotyp tables scraped from GitHub (once per URL)"""
+    github_page = _fetch(url).decode('utf-8')
+    return tuple(re.findall(r'title="(.*?)\.csv"', github_page))
+
+
+class Autotyp(_Dataset):
     """Autotyp database.
     
     Autotyp is database that contains of multiple modules.
@@ -285,85 +1594,132 @@ class Autotyp(object):
     @property
     def _mapping(self):
         """Get mapping from Autotyp LID to Glottocode"""
-        with open(
-            module_directory + os.path.sep + 'autotyp_lang_mapping.json',
-            'r', encoding='utf-8'
-        ) as f:
-            mapping = json.load(f)
-        return mapping
+        return _autotyp_mapping()
     
     @property
     def features_list(self):
         """list: List of available Autotyp tables."""
-        github_page = requests.get(
-            'https://github.com/autotyp/autotyp-data/tree/master/data'
-        ).content.decode('utf-8')
-        return re.findall('title="(.*?)\.csv"', github_page)
+        return list(_autotyp_tables(urls['autotyp_tables']))
+
+    def _cache_state(self):
+        return tuple(self.tables)
+
+    def _source_urls(self):
+        return [urls['autotyp'].format(table) for table in self.tables]
+
+    @_memoized
+    def get_df(self, strip_na=None, na_mode='sentinel'):
+        """Get data from Autotyp in pandas.DataFrame format.
+
+        Parameters
+        ----------
+        strip_na: list of str, default None
+            Drop rows where values in these columns are missing.
+        na_mode: str, default 'sentinel'
+            Either 'sentinel' ('~N/A~' for missing values) or
+            'nullable' (pandas nullable dtypes).
+
+        Returns
+        --------
+        pandas.DataFrame
+             DataFrame. Headers: 'language', 'glottocode', 'LID', [[features columns]]
+        """
+        return self._make_df(self._fetch_tables(), strip_na, na_mode)
+
+    @_memoized
+    async def aget_df(self, strip_na=None, na_mode='sentinel'):
+        """Asynchronous ``get_df``. The tables are downloaded concurrently."""
+        contents = await asyncio.gather(*[
+            _afetch_or_warn(
+                urls['autotyp'].format(table), 'Unable to find table ' + table
+            ) for table in self.tables
+        ])
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            None, self._make_df, contents, strip_na, na_mode
+        )
+
+    def _fetch_tables(self):
+        """Download the tables (None for tables that are not found)"""
+        return [
+            _fetch_or_warn(
+                urls['autotyp'].format(table), 'Unable to find table ' + table
+            ) for table in self.tables
+        ]
 
-    def get_df(self, strip_na=None):
-        """Get data from Autotyp in pandas.DataFrame format.
+    def _make_df(self, contents, strip_na, na_mode):
+        """Merge the downloaded tables into the resulting table"""
+        tables = self._read_tables(contents)
+        if tables is None:
+            return
+        return self._merge_tables(tables, strip_na, na_mode)
 
-        Returns
-        --------
-        pandas.DataFrame
-             DataFrame. Headers: 'Language', 'LID', [[features columns]]
-        """
+    def _iter_batches(self, chunksize, strip_na=None, na_mode='sentinel'):
+        tables = self._read_tables(self._fetch_tables())
+        if not tables:
+            return
+        #Rows of the first table are merged with the other tables by batches
+        first = tables[0]
+        for start in range(0, len(first), chunksize):
+            yield self._merge_tables(
+                [first.iloc[start:start + chunksize]] + tables[1:],
+                strip_na, na_mode
+            )
+
+    def _read_tables(self, contents):
+        """Parse the downloaded tables (None if no tables are given)"""
         if not self.tables:
             warnings.warn('No tables given. To get list of available ' \
                           'features use Autotyp.features_list')
             return
         if self.show_citation:
             print(self.citation)
+        return [
+            _parse(url, content, _read_csv) \
+                for url, content in zip(self._source_urls(), contents) \
+                    if content is not None
+        ]
 
+    def _merge_tables(self, tables, strip_na, na_mode):
+        """Merge the parsed tables by LID"""
         merged_df = pandas.DataFrame()
-        for table in self.tables:
-            try:
-                df = pandas.read_csv(
-                    'https://raw.githubusercontent.com/autotyp/' \
-                    'autotyp-data/master/data/{}.csv'.format(table)
-                )
-            except urllib.error.HTTPError:
-                warnings.warn('Unable to find table ' + table)
-                continue
-            df.fillna('~N/A~', inplace=True)
-
+        for df in tables:
             if merged_df.empty:
-                languages = []
-                for LID in df.LID:
-                    try:
-                        languages.append(
-                            lingtypology.glottolog.get_by_glot_id(
-                                self._mapping[str(LID)]
-                            )
-                        )
-                    except KeyError:
-                        warnings.warn('Unable to find Glottocode for ' + str(LID))
-                        languages.append('')
-                languages_df = pandas.DataFrame()
-                languages_df = languages_df.assign(language=languages)
+                glottocodes = df.LID.astype(str).map(self._mapping)
+                for LID in df.LID[glottocodes.isna()]:
+                    warnings.warn('Unable to find Glottocode for ' + str(LID))
+                languages = pandas.Series(
+                    lingtypology.glottolog.get_by_glot_ids(glottocodes),
+                    index=df.index, dtype=object
+                ).where(glottocodes.notna(), '')
+                languages_df = pandas.DataFrame({
+                    'language': languages, 'glottocode': glottocodes
+                })
                 merged_df = languages_df.join(df)
             else:
                 merged_df = pandas.merge(merged_df, df, on='LID')
-        merged_df.fillna('~N/A~', inplace=True)
-        if strip_na:
-            for column in strip_na:
-                merged_df = merged_df[merged_df[column] != '~N/A~']
+        merged_df = _fill_na(merged_df, na_mode)
+        merged_df = _strip_na(merged_df, strip_na, na_mode)
+        merged_df.attrs['dataset'] = 'autotyp'
+        merged_df.attrs['features'] = [
+            column for column in merged_df \
+                if column not in ('language', 'glottocode', 'LID')
+        ]
         return merged_df
 
-    def get_json(self, strip_na=None):
+    def get_json(self, strip_na=None, na_mode='sentinel'):
         """Get data from Autotyp in JSON format.
 
         Returns
         -------
         dict
-            Dictionary. Keys: 'Language', 'LID', [[features columns]]
+            Dictionary. Keys: 'language', 'glottocode', 'LID', [[features columns]]
         """
-        df = self.get_df(strip_na=strip_na)
-        js = {header: list(df[header]) for header in list(df)}
-        return js
+        df = self.get_df(strip_na=strip_na, na_mode=na_mode)
+        return _df_to_dict(df, na_mode)
 
 
-class AfBo(object):
+class AfBo(_Dataset):
     """AfBo database of borrowed affixes.
     
     AfBo: A world-wide survey of affix borrowing (Seifart 2013). AfBo contains
@@ -374,6 +1730,9 @@ class AfBo(object):
     ----------
     *features: list of str
         List of AfBo features that will be present in the resulting table. E.g. ``['adjectivizer']``.
+    download: bool, default True
+        Whether to download the data on initialization.
+        Otherwise it is downloaded by ``load``/``aload`` or the first ``get_df`` call.
     show_citation: bool, default True
         Whether to print the citation when ``get_df`` method is called.
     citation:
@@ -381,7 +1740,9 @@ class AfBo(object):
     features_list: list
         List of available features from AfBo.
     """
-    def __init__(self, *features):
+    _fetch_source = staticmethod(_fetch_verified)
+
+    def __init__(self, *features, download=True):
         """init
 
         features: list
@@ -402,22 +1763,59 @@ class AfBo(object):
             '(Available online at http://afbo.info, ' \
                 'Accessed on {}.)'.format(
                     datetime.datetime.now().strftime('%Y-%m-%d'))
+        self._loaded = False
+        if download:
+            self.load()
 
-        response = requests.get(
-            'https://cdstar.shh.mpg.de/bitstreams/' \
-            'EAEA0-59C8-38F2-28DC-0/afbo_pair.csv.zip'
-        )
-        with zipfile.ZipFile(io.BytesIO(response.content)) as thezip:
+    def load(self):
+        """Download the data.
+
+        Returns
+        -------
+        self
+        """
+        self._load(self._fetch_source(urls['afbo'])[0])
+        return self
+
+    async def aload(self):
+        """Download the data asynchronously.
+
+        The data is parsed in the default executor.
+
+        Returns
+        -------
+        self
+        """
+        content = await _afetch_large(urls['afbo'])
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._load, content)
+        return self
+
+    def _load(self, content):
+        """Read the ZIP archive with AfBo data"""
+        self.afbo_data = _parse(urls['afbo'], content, self._read_archive)
+        self.features_list = list(self.afbo_data)[10:]
+        self._loaded = True
+        self.clear_cache()
+
+    @staticmethod
+    def _read_archive(content):
+        """Parse the ZIP archive with AfBo data"""
+        with zipfile.ZipFile(io.BytesIO(content)) as thezip:
             for info in thezip.infolist():
                 if info.filename.endswith('.csv'):
                     with thezip.open(info) as thefile:
                         csv_data = thefile.read().decode('utf-8')
-        self.afbo_data = pandas.read_csv(
-            io.StringIO(csv_data), sep=',', header=0
-        )
-        self.afbo_data.fillna('0', inplace=True)
-        self.features_list = list(self.afbo_data)[10:]
+        afbo_data = pandas.read_csv(io.StringIO(csv_data), sep=',', header=0)
+        return afbo_data.fillna('0')
+
+    def _cache_state(self):
+        return tuple(self.features)
+
+    def _source_urls(self):
+        return [urls['afbo']]
 
+    @_memoized
     def get_df(self):
         """Get data from AfBo in pandas.DataFrame format.
 
@@ -426,30 +1824,51 @@ class AfBo(object):
         pandas.DataFrame
              DataFrame. Headers: 'Recipient_name', 'Donor_name', [[feature1]], [[feature2]], ...
         """
+        if not self._prepare():
+            return
+        return self._make_df(self.afbo_data)
+
+    def _iter_batches(self, chunksize):
+        if not self._prepare():
+            return
+        for start in range(0, len(self.afbo_data), chunksize):
+            yield self._make_df(self.afbo_data.iloc[start:start + chunksize])
+
+    def _prepare(self):
+        """Check features, load the data and print the citation"""
         if not self.features:
             warnings.warn(
                 'No tables given. To get list of ' \
                 'available features use AfBo.features_list'
             )
-            return
+            return False
+        if not self._loaded:
+            self.load()
         if self.show_citation:
             print(self.citation)
+        return True
 
+    def _make_df(self, afbo_data):
+        """Select the features from rows of the AfBo table"""
         df = pandas.DataFrame()
         df = df.assign(
-            language_recipient = self.afbo_data['Recipient name'],
-            language_donor = self.afbo_data['Donor name'],
-            reliability = self.afbo_data['reliability'],
+            language_recipient = afbo_data['Recipient name'],
+            language_donor = afbo_data['Donor name'],
+            reliability = afbo_data['reliability'],
         )
 
         for feature in self.features:
             try:
-                df[feature] = self.afbo_data[feature]
+                df[feature] = afbo_data[feature]
             except KeyError:
                 warnings.warn(
                     'No feature named {}. To get list of available ' \
                     'features use AfBo.features_list'.format(feature)
                 )
+        df.attrs['dataset'] = 'afbo'
+        df.attrs['features'] = [
+            feature for feature in self.features if feature in df
+        ]
         return df
 
     def get_json(self):
@@ -461,11 +1880,154 @@ class AfBo(object):
             Dictionary. Keys: 'Recipient_name', 'Donor_name', [[feature1]], [[feature2]], ...
         """
         df = self.get_df()
-        js = {header: list(df[header]) for header in list(df)}
-        return js
+        return _df_to_dict(df)
 
         
-class Sails(object):
+class CLDF(object):
+    """CLDF structure dataset.
+
+    Reads ``languages.csv``, ``parameters.csv``, ``values.csv`` (and ``codes.csv``
+    if present) of a CLDF dataset from a ZIP archive or a directory. In the values
+    table language, parameter and value columns are categorical: their codes are
+    positions in ``language_ids``, ``parameter_ids`` and the value categories,
+    so that requested parameters are selected and pivoted with numpy indexing.
+
+    Parameters
+    ----------
+    source: bytes or str
+        Contents of a ZIP archive, path to a ZIP archive or path to a directory.
+
+    Attributes
+    ----------
+    languages: pandas.DataFrame
+        CLDF table with info on languages.
+    parameters: pandas.DataFrame
+        CLDF table with info on parameters.
+    values: pandas.DataFrame
+        CLDF table with values of the parameters for different languages.
+        Columns 'Language_ID', 'Parameter_ID' and 'Value' are categorical.
+    codes: pandas.DataFrame or None
+        CLDF table with descriptions of the values.
+    language_ids: pandas.Index
+        IDs of the languages (IDs only found in the values table are
+        appended to the end).
+    parameter_ids: pandas.Index
+        IDs of the parameters.
+    """
+    tables = ('languages', 'parameters', 'values', 'codes')
+
+    def __init__(self, source):
+        contents = self._read(source)
+        for table in self.tables[:3]:
+            if table not in contents:
+                raise ValueError('No {}.csv in the CLDF dataset'.format(table))
+        self.languages = pandas.read_csv(
+            io.BytesIO(contents['languages']), dtype={'ID': str}
+        )
+        self.parameters = pandas.read_csv(
+            io.BytesIO(contents['parameters']), dtype={'ID': str}
+        )
+        values = pandas.read_csv(
+            io.BytesIO(contents['values']),
+            dtype={'Language_ID': str, 'Parameter_ID': str, 'Value': str}
+        )
+        self.codes = pandas.read_csv(io.BytesIO(contents['codes'])) \
+            if 'codes' in contents else None
+
+        language_ids = pandas.Index(self.languages.ID.drop_duplicates())
+        self.language_ids = language_ids.append(
+            pandas.Index(values.Language_ID.dropna().unique())
+                .difference(language_ids, sort=False)
+        )
+        self.parameter_ids = pandas.Index(
+            self.parameters.ID.drop_duplicates()
+        ).append(
+            pandas.Index(values.Parameter_ID.dropna().unique())
+                .difference(self.parameters.ID, sort=False)
+        )
+        values['Language_ID'] = pandas.Categorical(
+            values.Language_ID, categories=self.language_ids
+        )
+        values['Parameter_ID'] = pandas.Categorical(
+            values.Parameter_ID, categories=self.parameter_ids
+        )
+        values['Value'] = values.Value.astype('category')
+        self.values = values
+
+    @classmethod
+    def _read(cls, source):
+        """Read the CSV files (as bytes) of the dataset"""
+        names = {table + '.csv': table for table in cls.tables}
+        contents = {}
+        if isinstance(source, str) and os.path.isdir(source):
+            for filename in os.listdir(source):
+                if filename in names:
+                    with open(os.path.join(source, filename), 'rb') as f:
+                        contents[names[filename]] = f.read()
+            return contents
+        if isinstance(source, (bytes, bytearray)):
+            source = io.BytesIO(source)
+        with zipfile.ZipFile(source) as thezip:
+            for info in thezip.infolist():
+                filename = os.path.basename(info.filename)
+                if filename in names and names[filename] not in contents:
+                    with thezip.open(info) as thefile:
+                        contents[names[filename]] = thefile.read()
+        return contents
+
+    def pivot(self, parameters):
+        """Table of values of the given parameters.
+
+        Parameters
+        ----------
+        parameters: list of str
+            Parameter IDs. Unknown IDs are ignored.
+
+        Returns
+        -------
+        pandas.DataFrame
+            Index: language IDs (in the order they first appear for the given
+            parameters). Headers: parameter IDs. Values are categorical.
+            If a language has several values of a parameter, the first one
+            is taken.
+        """
+        positions = self.parameter_ids.get_indexer(pandas.Index(parameters))
+        known = [
+            parameter for parameter, position in zip(parameters, positions) \
+                if position != -1
+        ]
+        positions = positions[positions != -1]
+        columns = numpy.full(len(self.parameter_ids) + 1, -1)
+        columns[positions] = numpy.arange(len(positions))
+        #Code -1 (missing parameter) is mapped to the last element
+        column = columns[self.values.Parameter_ID.cat.codes.to_numpy()]
+        language = self.values.Language_ID.cat.codes.to_numpy()
+        rows = numpy.flatnonzero((column != -1) & (language != -1))
+        rows = rows[numpy.argsort(column[rows], kind='stable')]
+        column = column[rows]
+        language = language[rows]
+
+        unique, first = numpy.unique(language, return_index=True)
+        order = unique[numpy.argsort(first)]
+        row = numpy.empty(len(self.language_ids), dtype=numpy.int64)
+        row[order] = numpy.arange(len(order))
+        matrix = numpy.full((len(order), len(known)), -1, dtype=numpy.int64)
+        #Reversed so that the first value wins
+        matrix[row[language][::-1], column[::-1]] = \
+            self.values.Value.cat.codes.to_numpy()[rows][::-1]
+        categories = self.values.Value.cat.categories
+        return pandas.DataFrame(
+            {
+                parameter: pandas.Categorical.from_codes(
+                    matrix[:, i], categories=categories
+                ) for i, parameter in enumerate(known)
+            },
+            index=pandas.Index(self.language_ids[order], name='Language_ID'),
+            columns=known
+        )
+
+
+class Sails(_Dataset):
     """SAILS dataset.
     
     ‘The South American Indigenous Language Structures (SAILS) is a large database
@@ -478,6 +2040,9 @@ class Sails(object):
     ----------
     list of str
         List of SAILS pages that will be included in the resulting table.
+    download: bool, default True
+        Whether to download the data on initialization.
+        Otherwise it is downloaded by ``load``/``aload`` or the first ``get_df`` call.
     
     Attributes
     ----------
@@ -489,8 +2054,14 @@ class Sails(object):
         List of available features from SAILS.
     features_descriptions: pandas.DataFrame
         Table that contain description for all the SAILS pages.
+    coordinates_dtype: str, default 'float64'
+        Dtype of latitude and longitude columns.
+    coordinates_tuple: bool, default True
+        Whether to add coordinates column with tuples.
     """
-    def __init__(self, *features):
+    _fetch_source = staticmethod(_fetch_verified)
+
+    def __init__(self, *features, download=True):
         """init
 
         1) Setting attributes:
@@ -500,7 +2071,9 @@ class Sails(object):
                 Whether to show the citation.
             citation: str
                 Citation.
-        2) Ripping the archive from the website and setting:
+        2) Ripping the archive from the website (unless download is False) and setting:
+            cldf: CLDF
+                The dataset read by the generic CLDF reader.
             languages: pandas.DataFrame
                 CLLD table with info on languages.
             parameters: pandas.DataFrame
@@ -515,41 +2088,56 @@ class Sails(object):
         """
         self.features = features
         self.show_citation = True
+        self.coordinates_dtype = 'float64'
+        self.coordinates_tuple = True
         self.citation = \
             "You probably should cite it, " \
             "but I don't understand how. " \
             "Please, consult https://sails.clld.org/"
-        
-        response = requests.get(
-            'https://cdstar.shh.mpg.de/bitstreams/' \
-            'EAEA0-0A75-A1F1-F344-0/SAILS_dataset.cldf.zip'
-        )
-        with zipfile.ZipFile(io.BytesIO(response.content)) as thezip:
-            for info in thezip.infolist():
-                if info.filename == 'parameters.csv':
-                    with thezip.open(info) as thefile:
-                        parameters = thefile.read().decode('utf-8')
-                elif info.filename == 'languages.csv':
-                    with thezip.open(info) as thefile:
-                        languages = thefile.read().decode('utf-8')
-                elif info.filename == 'values.csv':
-                    with thezip.open(info) as thefile:
-                        values = thefile.read().decode('utf-8')
-        self.languages = pandas.read_csv(
-            io.StringIO(languages), sep=',', header=0
-        )
-        self.parameters = pandas.read_csv(
-            io.StringIO(parameters), sep=',', header=0
-        )
-        self.values = pandas.read_csv(
-            io.StringIO(values), sep=',', header=0
-        )
+        self._loaded = False
+        if download:
+            self.load()
+
+    def load(self):
+        """Download the data.
+
+        Returns
+        -------
+        self
+        """
+        self._load(self._fetch_source(urls['sails'])[0])
+        return self
+
+    async def aload(self):
+        """Download the data asynchronously.
+
+        The data is parsed in the default executor.
+
+        Returns
+        -------
+        self
+        """
+        content = await _afetch_large(urls['sails'])
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._load, content)
+        return self
+
+    def _load(self, content):
+        """Read the CLDF archive with SAILS data"""
+        self.cldf = _parse(urls['sails'], content, CLDF)
+        self.languages = self.cldf.languages
+        self.parameters = self.cldf.parameters
+        self.values = self.cldf.values
 
         self.features_list = sorted(list(set(self.parameters.ID)))
         self.features_descriptions = pandas.DataFrame({
             'Feature': self.parameters.ID,
             'Description': self.parameters.Name
         })
+        self._descriptions = self.parameters.drop_duplicates('ID') \
+            .set_index('ID').Name
+        self._loaded = True
+        self.clear_cache()
 
     def feature_descriptions(self, *features):
         """Get the description for particular features.
@@ -561,79 +2149,115 @@ class Sails(object):
         Returns
         -------
         pandas.DataFrame
+            Description is NaN for unknown features.
         """
-        descriptions = []
-        for feature in features:
-            descriptions += list(
-                self.parameters[self.parameters.ID == feature].Name
-            )
         return \
             pandas.DataFrame({
-                'Feature': features, 'Description': descriptions
+                'Feature': features,
+                'Description': self._descriptions.reindex(features).values
             })
 
-    def get_df(self):
+    def _cache_state(self):
+        return (tuple(self.features), self.coordinates_dtype,
+                self.coordinates_tuple)
+
+    def _source_urls(self):
+        return [urls['sails']]
+
+    @_memoized
+    def get_df(self, na_mode='sentinel'):
         """Get data from SAILS in pandas.DataFrame format.
 
+        Parameters
+        ----------
+        na_mode: str, default 'sentinel'
+            Either 'sentinel' ('~N/A~' for missing values) or
+            'nullable' (pandas nullable dtypes).
+
         Returns
         -------
         pandas.DataFrame
-             DataFrame. Headers: 'Language', 'Coordinates', [[feature 1]], \
-             [[feature 1 human_readable]], [[feature 2]], ...
+             DataFrame. Headers: 'language', 'glottocode', 'coordinates', \
+             'latitude', 'longitude', [[feature 1]], [[feature 1 human_readable]], \
+             [[feature 2]], ...
+             Rows are sorted by SAILS language ID if several features
+             are given.
+        """
+        return self._make_df(self._pivot(), na_mode)
+
+    def _iter_batches(self, chunksize, na_mode='sentinel'):
+        values = self._pivot()
+        for start in range(0, len(values), chunksize):
+            yield self._make_df(values.iloc[start:start + chunksize], na_mode)
+
+    def _pivot(self):
+        """Load the data, print the citation and pivot the features.
+
+        Rows are in the order of the values of the feature if only one
+        feature is given, otherwise sorted by language ID (as the outer
+        merge of the features sorted them).
         """
+        if not self._loaded:
+            self.load()
         if self.show_citation:
             print(self.citation)
-        merged_df = pandas.DataFrame()
-        for feature in self.features:
-            feature = feature.upper()
-            df = self.values[self.values.Parameter_ID == feature]
-            new_df = pandas.DataFrame()
-            #languages <- select all language names for language ids in the table with values
-            languages = [
-                list(self.languages[self.languages['ID'] == lang_id].Name)[0] \
-                    for lang_id in df['Language_ID']
-            ]
-            #latitudes <- select latitudes and longitudes from the language table and zip them
-            latitudes = [
-                list(self.languages[self.languages['Name'] == lang].Latitude)[0] \
-                    for lang in languages
-            ]
-            longitudes = [
-                list(self.languages[self.languages['Name'] == lang].Longitude)[0] \
-                    for lang in languages
-            ]
-            coordinates = list(zip(latitudes, longitudes))
-            new_df['language'] = languages
-            new_df['coordinates'] = coordinates
-            new_df[feature] = list(df.Value)
-            new_df[feature + '_desc'] = list(
-                df.Value.replace(['0', '1', '?'], ['No', 'Yes', '?'])
-            )
-            if merged_df.empty:
-                merged_df = new_df
-            else:
-                merged_df = pandas.merge(
-                    merged_df, new_df, how='outer',
-                    on=['language', 'coordinates']
-                )
-        merged_df.fillna('~N/A~', inplace=True)
+        values = self.cldf.pivot(
+            [feature.upper() for feature in self.features]
+        )
+        if len(values.columns) > 1:
+            values = values.sort_index(kind='stable')
+        return values
+
+    def _make_df(self, values, na_mode):
+        """Build the resulting table from rows of the pivoted values"""
+        merged_df = pandas.DataFrame({'Language_ID': values.index})
+        for feature in values:
+            value = values[feature].astype(object)
+            merged_df[feature] = value.values
+            merged_df[feature + '_desc'] = value.replace(
+                ['0', '1', '?'], ['No', 'Yes', '?']
+            ).values
+        #Names and coordinates are looked up by language ID all at once
+        languages = self.languages.set_index('ID').reindex(
+            merged_df.Language_ID
+        )
+        merged_df = pandas.concat([
+            pandas.DataFrame({
+                'language': languages.Name.values,
+                'glottocode': languages.Glottocode.values \
+                    if 'Glottocode' in languages else None,
+                'latitude': languages.Latitude.values,
+                'longitude': languages.Longitude.values,
+            }),
+            merged_df.drop(columns='Language_ID'),
+        ], axis=1)
+        merged_df = _format_coordinates(
+            merged_df, dtype=self.coordinates_dtype,
+            as_tuple=self.coordinates_tuple
+        )
+        merged_df = _fill_na(merged_df, na_mode)
+        merged_df.attrs['dataset'] = 'sails'
+        merged_df.attrs['features'] = [
+            feature.upper() for feature in self.features \
+                if feature.upper() in merged_df
+        ]
         return merged_df
 
-    def get_json(self):
+    def get_json(self, na_mode='sentinel'):
         """Get data from SAILS in JSON format.
 
         Returns
         -------
         dict
-            Dictionary. Keys: 'Language', 'Coordinates', [[feature 1]], \
-            [[feature 1 human_readable]], [[feature 2]], ...
+            Dictionary. Keys: 'language', 'glottocode', 'coordinates', \
+            'latitude', 'longitude', [[feature 1]], [[feature 1 human_readable]], \
+            [[feature 2]], ...
         """
-        df = self.get_df()
-        js = {header: list(df[header]) for header in list(df)}
-        return js
+        df = self.get_df(na_mode=na_mode)
+        return _df_to_dict(df, na_mode)
 
 
-class Phoible(object):
+class Phoible(_Dataset):
     """PHOIBLE phonological database.
     
     ‘PHOIBLE is a repository of cross-linguistic phonological inventory data,
@@ -666,6 +2290,11 @@ class Phoible(object):
     ----------
     subset: str, default 'all'
         One of the PHOIBLE datasets or all of them.
+    aggregated: bool, default True
+        Whether to use aggregated data (inventories) or full data (phonemes).
+    download: bool, default True
+        Whether to download the data on initialization.
+        Otherwise it is downloaded by ``load``/``aload`` or the first ``get_df`` call.
     
     Attributes
     ----------
@@ -675,8 +2304,14 @@ class Phoible(object):
         Citation for PKOIBLE.
     subsets_list: list
         List of available subsets of PHOIBLE.
+    coordinates_dtype: str, default 'float64'
+        Dtype of latitude and longitude columns (aggregated data only).
+    coordinates_tuple: bool, default True
+        Whether to add coordinates column with tuples (aggregated data only).
     """
-    def __init__(self, subset='all', aggregated=True):
+    _fetch_source = staticmethod(_fetch_verified)
+
+    def __init__(self, subset='all', aggregated=True, download=True):
         """init
 
         show_citation: bool, default True
@@ -689,6 +2324,8 @@ class Phoible(object):
             List of available subsets of Phoible.
         """
         self.show_citation = True
+        self.coordinates_dtype = 'float64'
+        self.coordinates_tuple = True
         self.citation = \
             'Moran, Steven & McCloy, Daniel (eds.) 2019.\nPHOIBLE 2.0.\n' \
             'Jena: Max Planck Institute for the Science of Human History.\n' \
@@ -699,31 +2336,103 @@ class Phoible(object):
         
         self.subset = subset
         self.aggregated = aggregated
-        if aggregated:
-            self.inventories = pandas.read_csv(
-                'https://phoible.org/inventories.csv',
-                sep=',', header=0
-            )
-            self.languages = pandas.read_csv(
-                'https://phoible.org/languages.csv',
-                sep=',', header=0
-            )
+        self._loaded = False
+        if download:
+            self.load()
+
+    @property
+    def _urls(self):
+        """URLs of the files that are needed"""
+        if self.aggregated:
+            return [urls['phoible_inventories'], urls['phoible_languages']]
+        return [urls['phoible']]
+
+    def load(self):
+        """Download the data.
+
+        Returns
+        -------
+        self
+        """
+        self._load([self._fetch_source(url)[0] for url in self._urls])
+        return self
+
+    async def aload(self):
+        """Download the data asynchronously. The files are downloaded concurrently.
+
+        The data is parsed in the default executor.
+
+        Returns
+        -------
+        self
+        """
+        contents = await asyncio.gather(
+            *[_afetch_large(url) for url in self._urls]
+        )
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._load, contents)
+        return self
+
+    def _load(self, contents):
+        """Read the downloaded CSV files"""
+        tables = [
+            _parse(url, content, _read_csv) \
+                for url, content in zip(self._urls, contents)
+        ]
+        if self.aggregated:
+            self.inventories, self.languages = tables
         else:
-            self.full_data = pandas.read_csv(
-                'https://raw.githubusercontent.com' \
-                '/phoible/dev/master/data/phoible.csv',
-                sep=',', header=0, low_memory=False
-            )
+            self.full_data, = tables
+        self._loaded = True
+        self.clear_cache()
+
+    def _cache_state(self):
+        return (self.subset, self.aggregated, self.coordinates_dtype,
+                self.coordinates_tuple)
+
+    def _source_urls(self):
+        return self._urls
 
-    def get_df(self, strip_na=None):
+    @_memoized
+    def get_df(self, strip_na=None, na_mode='sentinel'):
         """Get data from PHOIBLE in pandas.DataFrame format.
 
+        Parameters
+        ----------
+        strip_na: list of str, default None
+            Drop rows where values in these columns are missing.
+        na_mode: str, default 'sentinel'
+            Either 'sentinel' ('~N/A~' for missing values) or
+            'nullable' (pandas nullable dtypes).
+
         Returns
         -------
         pandas.DataFrame
-            DataFrame. Headers: 'contribution_name', 'language', 'coordinates', 'glottocode', \
-            'macroarea', 'consonants', 'vowels', 'source', 'inventory_page'
+            DataFrame. Headers: 'contribution_name', 'language', 'coordinates', \
+            'latitude', 'longitude', 'glottocode', 'macroarea', 'consonants', 'vowels', 'source', 'inventory_page'
+        """
+        rows, inventories = self._source()
+        return self._make_df(rows, inventories, strip_na, na_mode)
+
+    def _iter_batches(self, chunksize, strip_na=None, na_mode='sentinel'):
+        rows, inventories = self._source()
+        for start in range(0, len(rows), chunksize):
+            yield self._make_df(
+                rows.iloc[start:start + chunksize], inventories,
+                strip_na, na_mode
+            )
+
+    def _source(self):
+        """Load the data, print the citation and select the tables.
+
+        Returns
+        -------
+        tuple
+            Languages and inventories of the subset if the data is aggregated.
+            Otherwise rows of PHOIBLE table of the subset and None.
         """
+        if not self._loaded:
+            self.load()
         if self.show_citation:
             print(self.citation)
         if self.aggregated:
@@ -741,14 +2450,24 @@ class Phoible(object):
                 'macroarea', 'name', 'pk'
             ]]
             languages = languages.rename(columns={'name': 'language'})
+            return languages, inventories
+        df = self.full_data
+        if self.subset != 'all':
+            df = df[df.Source == self.subset.lower()]
+        return df, None
+
+    def _make_df(self, rows, inventories, strip_na, na_mode):
+        """Build the resulting table from rows of the source table"""
+        if self.aggregated:
             pre_df = pandas.merge(
-                languages, inventories,
+                rows, inventories,
                 left_on='pk', right_on='language_pk'
             )
             df = pandas.DataFrame({
                 'contribution_name': pre_df.name,
                 'language': pre_df.language,
-                'coordinates': list(zip(pre_df.latitude, pre_df.longitude)),
+                'latitude': pre_df.latitude,
+                'longitude': pre_df.longitude,
                 'glottocode': pre_df.id,
                 'macroarea': pre_df.macroarea,
                 'phonemes': pre_df.count_consonant + pre_df.count_vowel,
@@ -758,25 +2477,319 @@ class Phoible(object):
                 'source': pre_df.source_url,
                 'inventory_page': 'https://phoible.org/languages/' + pre_df.id
             })
+            df = _format_coordinates(
+                df, dtype=self.coordinates_dtype,
+                as_tuple=self.coordinates_tuple
+            )
         else:
-            df = self.full_data
-            if self.subset != 'all':
-                df = df[df.Source == self.subset.lower()]
-        df = df.fillna('~N/A~')
-        if strip_na:
-            for column in strip_na:
-                df = df[df[column] != '~N/A~']
+            df = rows
+        df = _fill_na(df, na_mode)
+        df = _strip_na(df, strip_na, na_mode)
+        df.attrs['dataset'] = 'phoible'
+        if self.aggregated:
+            df.attrs['features'] = ['phonemes', 'consonants', 'vowels', 'tones']
+        else:
+            df.attrs['features'] = ['Phoneme']
         return df
 
-    def get_json(self, strip_na=None):
+    def get_json(self, strip_na=None, na_mode='sentinel'):
         """Get data from PHOIBLE in JSON format.
 
         Returns
         -------
         dict
-            Dictionary. Keys: 'contribution_name', 'language', 'coordinates', 'glottocode', \
-            'macroarea', 'consonants', 'vowels', 'source', 'inventory_page'
+            Dictionary. Keys: 'contribution_name', 'language', 'coordinates', \
+            'latitude', 'longitude', 'glottocode', 'macroarea', 'consonants', 'vowels', 'source', 'inventory_page'
+        """
+        df = self.get_df(strip_na=strip_na, na_mode=na_mode)
+        return _df_to_dict(df, na_mode)
+
+
+def _get_glottocodes(df):
+    """Glottocodes for the rows of the dataset table (None if unknown).
+
+    Glottocode columns are used as is. Otherwise ISO 639-3 codes are looked
+    up first (names are ambiguous more often), then language names.
+    """
+    for column in ('glottocode', 'Glottocode'):
+        if column in df:
+            return [
+                code if isinstance(code, str) and code != '~N/A~' else None \
+                    for code in df[column]
+            ]
+    glottocodes = None
+    for column in ('ISO6393', 'iso_code', 'ISO639P3code'):
+        if column in df:
+            glottocodes = lingtypology.glottolog.get_glot_ids_by_iso(df[column])
+            break
+    for column in ('language', 'language_recipient'):
+        if column in df:
+            by_name = lingtypology.glottolog.get_glot_ids(df[column])
+            if glottocodes is None:
+                return by_name
+            return [
+                code if code is not None else name_code \
+                    for code, name_code in zip(glottocodes, by_name)
+            ]
+    if glottocodes is not None:
+        return glottocodes
+    raise ValueError(
+        'Unable to find either Glottocodes or language names in the table'
+    )
+
+
+def join(*results, how='outer'):
+    """Join tables of different datasets by Glottocode.
+
+    Parameters
+    ----------
+    *results: pandas.DataFrame or datasets
+        Tables returned by ``get_df`` or dataset objects (then ``get_df``
+        is called with default parameters).
+    how: str, default 'outer'
+        If 'outer', the table contains languages present in at least one
+        of the tables. If 'inner', only languages present in all of them.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Index: Glottocodes. Headers: 'language' (name from Glottolog),
+        [[dataset]]:[[column]], ... (e.g. 'wals:_1A', 'phoible:vowels').
+        If a language has several rows in a table (e.g. several PHOIBLE
+        inventories), the first one is used.
+    """
+    tables = []
+    names = []
+    for i, result in enumerate(results):
+        df = result if isinstance(result, pandas.DataFrame) else result.get_df()
+        if df is None:
+            continue
+        name = df.attrs.get('dataset', 'table{}'.format(i + 1))
+        if name in names:
+            name = '{}{}'.format(name, i + 1)
+        names.append(name)
+        df = df.set_axis(pandas.Index(_get_glottocodes(df), name='glottocode'))
+        df = df[df.index.notna() & ~df.index.duplicated()]
+        df = df.drop(columns=['glottocode', 'Glottocode'], errors='ignore')
+        tables.append(df.add_prefix(name + ':'))
+    joined = pandas.concat(tables, axis=1, join=how)
+    joined.insert(
+        0, 'language',
+        lingtypology.glottolog.get_by_glot_ids(joined.index)
+    )
+    return joined
+
+
+#Number of set bits of each byte
+_bit_counts = numpy.array([bin(i).count('1') for i in range(256)])
+
+
+class Coverage(object):
+    """Language × feature coverage matrix.
+
+    Rows are Glottocodes, columns are features named
+    [[dataset]]:[[feature]] (e.g. 'wals:_1A', 'sails:ICU1').
+    A cell is True if the language has a value for the feature.
+
+    The matrix is stored as a bitmap (rows packed by ``numpy.packbits``,
+    one bit per cell). Tables given to ``add`` are kept aside and packed
+    into the bitmap at once when it is needed.
+
+    Attributes
+    ----------
+    languages: pandas.Index
+        Glottocodes (rows).
+    features: pandas.Index
+        Feature names (columns).
+    matrix: numpy.ndarray
+        Boolean matrix of shape (len(languages), len(features)) unpacked
+        from the bitmap.
+    """
+    def __init__(self, *results):
+        """
+        Parameters
+        ----------
+        *results: pandas.DataFrame or datasets
+            Passed to ``add``.
+        """
+        self.languages = pandas.Index([], dtype=object, name='glottocode')
+        self.features = pandas.Index([], dtype=object, name='feature')
+        self.matrix = numpy.zeros((0, 0), dtype=bool)
+        self.add(*results)
+
+    @property
+    def matrix(self):
+        return numpy.unpackbits(
+            self._get_bits(), axis=1, count=len(self.features)
+        ).astype(bool)
+
+    @matrix.setter
+    def matrix(self, matrix):
+        self._bits = numpy.packbits(numpy.asarray(matrix, dtype=bool), axis=1)
+        self._pending = []
+
+    def add(self, *results):
+        """Add features of the given tables to the matrix.
+
+        Parameters
+        ----------
+        *results: pandas.DataFrame or datasets
+            Tables returned by ``get_df`` or dataset objects (then ``get_df``
+            is called with default parameters). Feature columns are taken from
+            ``attrs['features']`` of the table. If a language has several
+            rows (e.g. several PHOIBLE inventories), it has a value if
+            at least one of them has it.
+
+        Returns
+        -------
+        Coverage
+            The same object.
+        """
+        for result in results:
+            df = result if isinstance(result, pandas.DataFrame) else result.get_df()
+            if df is None:
+                continue
+            dataset = df.attrs.get('dataset', 'table')
+            columns = df.attrs.get('features', [])
+            if not columns:
+                warnings.warn('No features found in the {} table'.format(dataset))
+                continue
+            glottocodes = pandas.Series(_get_glottocodes(df), dtype=object)
+            values = df[columns]
+            present = (values.notna() & (values != '~N/A~')).to_numpy(dtype=bool)
+            present = pandas.DataFrame(present[glottocodes.notna().to_numpy()])
+            present = present.groupby(glottocodes.dropna().to_numpy()).any()
+            features = pandas.Index(
+                ['{}:{}'.format(dataset, column) for column in columns]
+            )
+            self.languages = self.languages.append(
+                present.index.difference(self.languages, sort=False)
+            ).rename('glottocode')
+            self.features = self.features.append(
+                features.difference(self.features, sort=False)
+            ).rename('feature')
+            self._pending.append((present.index, features, present.to_numpy()))
+        return self
+
+    def _get_bits(self):
+        """Bitmap with the pending tables packed into it"""
+        if not self._pending and \
+                self._bits.shape == (len(self.languages), self._width()):
+            return self._bits
+        bits = numpy.zeros(
+            (len(self.languages), self._width()), dtype=numpy.uint8
+        )
+        #Old features are the first columns and unused bits are zeros
+        bits[:self._bits.shape[0], :self._bits.shape[1]] = self._bits
+        for languages, features, present in self._pending:
+            block = numpy.zeros((len(languages), len(self.features)), dtype=bool)
+            block[:, self.features.get_indexer(features)] = present
+            bits[self.languages.get_indexer(languages)] |= \
+                numpy.packbits(block, axis=1)
+        self._bits = bits
+        self._pending = []
+        return bits
+
+    def _width(self):
+        """Bytes per row of the bitmap"""
+        return (len(self.features) + 7) // 8
+
+    def select(self, languages=None, features=None):
+        """Slice the matrix.
+
+        Parameters
+        ----------
+        languages: list of str, default None
+            Glottocodes. If None, all languages.
+        features: list of str, default None
+            Feature names. If None, all features.
+
+        Returns
+        -------
+        Coverage
+            New object. Unknown languages and features are ignored.
         """
-        df = self.get_df(strip_na=strip_na)
-        js = {header: list(df[header]) for header in list(df)}
-        return js
+        rows = slice(None)
+        cols = slice(None)
+        coverage = Coverage()
+        coverage.languages = self.languages
+        coverage.features = self.features
+        if languages is not None:
+            rows = self.languages.get_indexer(pandas.Index(languages))
+            rows = rows[rows != -1]
+            coverage.languages = self.languages[rows]
+        if features is not None:
+            cols = self.features.get_indexer(pandas.Index(features))
+            cols = cols[cols != -1]
+            coverage.features = self.features[cols]
+        if features is None:
+            coverage._bits = self._get_bits()[rows]
+        else:
+            coverage.matrix = numpy.unpackbits(
+                self._get_bits()[rows], axis=1, count=len(self.features)
+            )[:, cols].astype(bool)
+        return coverage
+
+    def share(self, features=None):
+        """Share of the given features each language has.
+
+        Parameters
+        ----------
+        features: list of str, default None
+            Feature names. If None, all features.
+
+        Returns
+        -------
+        pandas.Series
+            Index: Glottocodes. Values: floats from 0 to 1.
+        """
+        coverage = self.select(features=features)
+        if not len(coverage.features):
+            return pandas.Series(0.0, index=self.languages)
+        counts = _bit_counts[coverage._get_bits()].sum(axis=1)
+        return pandas.Series(
+            counts / len(coverage.features), index=self.languages
+        )
+
+    def get_languages(self, features=None, threshold=1.0):
+        """Languages that have at least ``threshold`` share of the given features.
+
+        Parameters
+        ----------
+        features: list of str, default None
+            Feature names. If None, all features.
+        threshold: float, default 1.0
+            E.g. 0.8 means 80% of the features.
+
+        Returns
+        -------
+        pandas.Index
+            Glottocodes.
+        """
+        share = self.share(features)
+        return share.index[share.to_numpy() >= threshold]
+
+    def get_df(self):
+        """Get the matrix as boolean pandas.DataFrame.
+
+        Returns
+        -------
+        pandas.DataFrame
+            Index: Glottocodes. Headers: feature names.
+        """
+        return pandas.DataFrame(
+            self.matrix, index=self.languages, columns=self.features
+        )
+
+    def to_sparse(self):
+        """Get the matrix as scipy.sparse.csr_matrix (requires scipy).
+
+        Returns
+        -------
+        scipy.sparse.csr_matrix
+        """
+        try:
+            import scipy.sparse
+        except ImportError:
+            raise ImportError('to_sparse requires scipy')
+        return scipy.sparse.csr_matrix(self.matrix)
@@ -0,0 +1,197 @@
+"""
+lingtypology-fetch
+~~~~~~~~~~~~~~~~~~
+
+Command line tool that downloads the datasets into the cache (see
+``lingtypology.datasets.set_cache_directory``) in parallel, parses them and
+stores the parsed snapshots, so that later jobs do no network I/O.
+
+.. code-block:: shell
+
+    lingtypology-fetch --wals 1A 2A --autotyp Gender --sails --afbo --phoible
+    lingtypology-fetch --all --jobs 8 --cache /opt/lingtypology
+
+``--wals`` and ``--autotyp`` without values fetch all WALS chapters (Autotyp tables).
+``--glottolog REPOS`` converts a local clone of Glottolog into the table that
+``lingtypology.glottolog`` uses (it requires ``pyglottolog``).
+
+The tool prints progress to stderr and writes ``fetch-manifest.json`` (fetched
+items, their URLs and SHA-256) into the cache directory. To use the cache
+without network, set the environment variables:
+
+.. code-block:: shell
+
+    LINGTYPOLOGY_CACHE=/opt/lingtypology LINGTYPOLOGY_OFFLINE=1
+"""
+import argparse
+import concurrent.futures
+import datetime
+import json
+import os
+import pathlib
+import subprocess
+import sys
+import time
+import lingtypology.datasets as datasets
+
+data_directory = os.path.join(str(pathlib.Path.home()), '.lingtypology_data')
+
+
+def _fetch_wals(feature):
+    if datasets.Wals(feature)._get_wals_data(feature) is None:
+        raise ValueError('Unable to fetch WALS feature ' + feature)
+    return [datasets.urls['wals'].format(feature)]
+
+
+def _fetch_autotyp(table):
+    url = datasets.urls['autotyp'].format(table)
+    datasets._parse(url, datasets._fetch(url), datasets._read_csv)
+    return [url]
+
+
+def _fetch_dataset(cls, **kwargs):
+    return cls(**kwargs)._source_urls()
+
+
+def _convert_glottolog(repos):
+    os.makedirs(data_directory, exist_ok=True)
+    subprocess.run(
+        ['glottolog', '--repos=' + os.path.abspath(repos), 'languoids'],
+        cwd=data_directory, check=True
+    )
+    return []
+
+
+def get_tasks(args):
+    """List of (name, function) pairs for the parsed arguments"""
+    tasks = []
+    if args.glottolog:
+        tasks.append((
+            'glottolog', lambda: _convert_glottolog(args.glottolog)
+        ))
+    if args.wals is not None or args.all:
+        features = args.wals or datasets.Wals.features_list
+        for feature in features:
+            tasks.append((
+                'wals ' + feature.upper(),
+                lambda feature=feature: _fetch_wals(feature.upper())
+            ))
+    if args.autotyp is not None or args.all:
+        tables = args.autotyp or datasets.Autotyp().features_list
+        for table in tables:
+            tasks.append((
+                'autotyp ' + table,
+                lambda table=table: _fetch_autotyp(table)
+            ))
+    if args.afbo or args.all:
+        tasks.append(('afbo', lambda: _fetch_dataset(datasets.AfBo)))
+    if args.sails or args.all:
+        tasks.append(('sails', lambda: _fetch_dataset(datasets.Sails)))
+    if args.phoible or args.all:
+        tasks.append(('phoible (aggregated)', lambda: _fetch_dataset(
+            datasets.Phoible, aggregated=True
+        )))
+        tasks.append(('phoible', lambda: _fetch_dataset(
+            datasets.Phoible, aggregated=False
+        )))
+    return tasks
+
+
+def run(tasks, jobs=4, stream=sys.stderr):
+    """Run the tasks in parallel printing progress.
+
+    Returns
+    -------
+    dict
+        Keys: names of the tasks. Values: dicts with keys 'status'
+        ('ok' or 'error'), 'seconds' and 'urls' or 'error'.
+    """
+    results = {}
+    start = time.time()
+    with concurrent.futures.ThreadPoolExecutor(jobs) as executor:
+        futures = {
+            executor.submit(function): name for name, function in tasks
+        }
+        for i, future in enumerate(concurrent.futures.as_completed(futures)):
+            name = futures[future]
+            try:
+                result = {'status': 'ok', 'urls': future.result()}
+            except Exception as error:
+                result = {'status': 'error', 'error': repr(error)}
+            result['seconds'] = round(time.time() - start, 1)
+            results[name] = result
+            print(
+                '[{}/{}] {}: {} ({} s)'.format(
+                    i + 1, len(tasks), name,
+                    result.get('error', 'ok'), result['seconds']
+                ),
+                file=stream
+            )
+    return results
+
+
+def write_manifest(results, directory):
+    """Write fetch-manifest.json with the results and versions of the files"""
+    manifest = datasets.get_manifest()
+    for result in results.values():
+        result['sha256'] = {
+            url: manifest.get(url, {}).get('sha256') \
+                for url in result.get('urls', [])
+        }
+    path = os.path.join(directory, 'fetch-manifest.json')
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({
+            'created': datetime.datetime.now().isoformat(),
+            'items': results,
+        }, f, indent=1, sort_keys=True)
+    return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='lingtypology-fetch',
+        description='Download and parse datasets into the lingtypology cache.'
+    )
+    parser.add_argument(
+        '--cache', default=os.path.join(data_directory, 'cache'),
+        help='cache directory (default: %(default)s)'
+    )
+    parser.add_argument(
+        '--wals', nargs='*', metavar='FEATURE',
+        help='WALS chapters (all if no chapters are given)'
+    )
+    parser.add_argument(
+        '--autotyp', nargs='*', metavar='TABLE',
+        help='Autotyp tables (all if no tables are given)'
+    )
+    parser.add_argument('--afbo', action='store_true', help='AfBo archive')
+    parser.add_argument('--sails', action='store_true', help='SAILS archive')
+    parser.add_argument(
+        '--phoible', action='store_true',
+        help='PHOIBLE (both aggregated and full tables)'
+    )
+    parser.add_argument('--all', action='store_true', help='all the datasets')
+    parser.add_argument(
+        '--glottolog', metavar='REPOS',
+        help='convert local clone of Glottolog with pyglottolog'
+    )
+    parser.add_argument(
+        '--jobs', type=int, default=4,
+        help='number of parallel downloads (default: %(default)s)'
+    )
+    args = parser.parse_args(argv)
+
+    datasets.set_cache_directory(args.cache)
+    tasks = get_tasks(args)
+    if not tasks:
+        parser.error('nothing to fetch')
+    results = run(tasks, jobs=args.jobs)
+    path = write_manifest(results, args.cache)
+    print('Manifest: ' + path, file=sys.stderr)
+    failed = [name for name, result in results.items() \
+              if result['status'] != 'ok']
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
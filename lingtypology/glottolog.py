@@ -4,9 +4,24 @@ Functions
 
 Glottolog module includes various functions to work with Glottolog data.
 
-The only funcntion that accepts list-like objects and returns *list* is
-**get_affiliations**. Its **parameter** is language names, it
-**returns** the genealogical information for the given languages.
+Function **get_affiliations** accepts list-like objects and returns *list*.
+Its **parameter** is language names, it **returns** the genealogical
+information for the given languages.
+
+The following functions also accept list-like objects and return *list*
+(None for values that are not found). They look the values up in an index
+that is built once, so they are much faster than calling the functions
+below in a loop:
+
+-  lingtypology.glottolog.\ **get_glot_ids** (language names → Glottocodes)
+
+-  lingtypology.glottolog.\ **get_glot_ids_by_iso** (ISO codes → Glottocodes)
+
+-  lingtypology.glottolog.\ **get_by_glot_ids** (Glottocodes → language names)
+
+-  lingtypology.glottolog.\ **get_coordinates_list** (language names → coordinates)
+
+-  lingtypology.glottolog.\ **get_coordinates_list_by_glot_ids** (Glottocodes → coordinates)
 
 The **parameter** of all the other functions is *str* and they
 **return** *str*.
@@ -101,9 +116,99 @@ except (FileNotFoundError, IndexError):
 
 glottolog = pandas.read_csv(path, delimiter=',', header=0)
 warnings = []
+_indices = {}
 #---------------------------------------------------------------------------------
 
 
+def _get_index(column):
+    """Glottolog table indexed by the column.
+
+    Only the first row for each value is kept (as in get_glot_id etc.).
+    The index is built once and rebuilt if the glottolog table is replaced.
+    """
+    table, index = _indices.get(column, (None, None))
+    if table is not glottolog:
+        index = glottolog.dropna(subset=[column]) \
+            .drop_duplicates(column).set_index(column)
+        _indices[column] = (glottolog, index)
+    return index
+
+
+def _lookup(values, by, column):
+    """Look the values up in the index and return list (None if not found)"""
+    found = _get_index(by)[column].reindex(list(values))
+    return found.astype(object).where(found.notna(), None).tolist()
+
+
+def get_glot_ids(languages):
+    '''
+    get_glot_ids(('Russian', 'English'))
+    >>> ['russ1263', 'stan1293']
+    '''
+    return _lookup(languages, 'Name', 'ID')
+
+
+def get_glot_ids_by_iso(isos):
+    '''
+    get_glot_ids_by_iso(('rus', 'eng'))
+    >>> ['russ1263', 'stan1293']
+    '''
+    return _lookup(isos, 'ISO639P3code', 'ID')
+
+
+def get_by_glot_ids(glot_ids):
+    '''
+    get_by_glot_ids(('russ1263', 'stan1293'))
+    >>> ['Russian', 'English']
+    '''
+    return _lookup(glot_ids, 'ID', 'Name')
+
+
+def _get_counts(column):
+    """Number of rows of the Glottolog table for each value of the column"""
+    table, counts = _indices.get((column, 'counts'), (None, None))
+    if table is not glottolog:
+        counts = glottolog[column].value_counts()
+        _indices[(column, 'counts')] = (glottolog, counts)
+    return counts
+
+
+def _lookup_coordinates(values, by):
+    """Coordinates of the values (None and a warning if not found).
+
+    As in get_coordinates, ambiguous values (several rows) are not found.
+    """
+    values = list(values)
+    found = _get_index(by)[['Latitude', 'Longitude']].reindex(values)
+    unique = _get_counts(by).reindex(values).to_numpy() == 1
+    coordinates = []
+    for value, is_unique, latitude, longitude in zip(
+        values, unique, found.Latitude.tolist(), found.Longitude.tolist()
+    ):
+        if is_unique:
+            coordinates.append((latitude, longitude))
+        else:
+            warnings.append(value)
+            coordinates.append(None)
+    return coordinates
+
+
+def get_coordinates_list(languages):
+    '''
+    get_coordinates_list(('Russian', 'English'))
+    >>> [(59.0, 50.0), (53.0, -1.0)]
+    '''
+    return _lookup_coordinates(languages, 'Name')
+
+
+def get_coordinates_list_by_glot_ids(glot_ids):
+    '''
+    get_coordinates_list_by_glot_ids(('russ1263', 'stan1293'))
+    >>> [(59.0, 50.0), (53.0, -1.0)]
+    '''
+    return _lookup_coordinates(glot_ids, 'ID')
+
+
 def get_affiliations(languages):
     '''
     get_affiliations(('Russian', 'English'))
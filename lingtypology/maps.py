@@ -5,6 +5,7 @@ import branca.colormap
 import branca.element
 
 import jinja2
+import numpy
 import pandas
 import json
 import math
@@ -15,6 +16,7 @@ import random
 import matplotlib.pyplot as plt
 import colour
 import collections
+import itertools
 
 import lingtypology.glottolog
 from lingtypology.lingtypology_exceptions import LingMapError
@@ -119,6 +121,145 @@ def _frange(start, stop, step):
         yield start
         start += step
 
+#Ids of gradients in colormap legends (unique in case of merged maps)
+_gradient_ids = itertools.count()
+
+#Compiled templates from the module directory
+_templates = {}
+
+def _get_template(name):
+    """Loads and compiles the template once per process"""
+    if name not in _templates:
+        with open(MODULE_DIRECTORY + name, 'r', encoding='utf-8') as f:
+            _templates[name] = jinja2.Template(f.read())
+    return _templates[name]
+
+class _Legend(branca.element.Element):
+    """Element with rendered HTML of a legend or a title.
+
+    The template is compiled once and shared by all the legends, the HTML
+    is not parsed as a template again.
+    """
+    _template = branca.element.Template('{{ this.html }}')
+
+    def __init__(self, html):
+        super(_Legend, self).__init__()
+        self._name = 'Legend'
+        self.html = html
+
+class _GeoJsonLayer(branca.element.MacroElement):
+    """Markers as one GeoJSON layer drawn on canvas by one style function"""
+    _template = branca.element.Template("""
+{% macro script(this, kwargs) %}
+    var {{ this.get_name() }}_options = {{ this.options }};
+    var {{ this.get_name() }}_renderer = L.canvas();
+    var {{ this.get_name() }} = L.geoJson({{ this.data }}, {
+        pointToLayer: function (feature, latlng) {
+            return L.circleMarker(
+                latlng, {renderer: {{ this.get_name() }}_renderer}
+            );
+        },
+        style: function (feature) {
+            var options = {{ this.get_name() }}_options;
+            var properties = feature.properties;
+            if (properties.s_color === undefined) {
+                return {
+                    radius: options.radius, fill: true,
+                    fillColor: properties.color, fillOpacity: options.opacity,
+                    stroke: options.stroked, color: '#000000', weight: 1,
+                    opacity: options.opacity
+                };
+            }
+            return {
+                radius: (options.radius + options.stroke_radius) / 2,
+                fill: true, fillColor: properties.color,
+                fillOpacity: options.opacity, stroke: true,
+                color: properties.s_color,
+                weight: options.stroke_radius - options.radius,
+                opacity: options.stroke_opacity
+            };
+        },
+        onEachFeature: function (feature, layer) {
+            if (feature.properties.popup !== undefined) {
+                layer.bindPopup(feature.properties.popup);
+            }
+            if (feature.properties.tooltip !== undefined) {
+                layer.bindTooltip(feature.properties.tooltip);
+            }
+        }
+    }).addTo({{ this._parent.get_name() }});
+{% endmacro %}
+""")
+
+    def __init__(self, data, options):
+        super(_GeoJsonLayer, self).__init__()
+        self._name = 'GeoJsonLayer'
+        self.data = _to_json(data)
+        self.options = _to_json(options)
+
+#Row of cluster data: [latitude, longitude, color code, popup, tooltip,
+#stroke color code]
+_cluster_callback = """function (row) {
+    var options = %(options)s;
+    var style = {
+        radius: options.radius, fill: true,
+        fillColor: options.palette[row[2]], fillOpacity: options.opacity,
+        stroke: options.stroked, color: '#000000', weight: 1,
+        opacity: options.opacity
+    };
+    if (row[5] !== null) {
+        style.radius = (options.radius + options.stroke_radius) / 2;
+        style.stroke = true;
+        style.color = options.s_palette[row[5]];
+        style.weight = options.stroke_radius - options.radius;
+        style.opacity = options.stroke_opacity;
+    }
+    var marker = L.circleMarker(new L.LatLng(row[0], row[1]), style);
+    marker.options.code = row[2];
+    if (row[3] !== null) {
+        marker.bindPopup(row[3]);
+    }
+    if (row[4] !== null) {
+        marker.bindTooltip(row[4]);
+    }
+    return marker;
+}"""
+
+#Cluster icon is a pie chart (conic-gradient) of colors of the markers
+_cluster_icon = """function (cluster) {
+    var palette = %(palette)s;
+    var counts = new Array(palette.length).fill(0);
+    var markers = cluster.getAllChildMarkers();
+    for (var i = 0; i < markers.length; i++) {
+        counts[markers[i].options.code] += 1;
+    }
+    var stops = [];
+    var start = 0;
+    for (var code = 0; code < palette.length; code++) {
+        if (counts[code]) {
+            var end = start + 360 * counts[code] / markers.length;
+            stops.push(palette[code] + ' ' + start + 'deg ' + end + 'deg');
+            start = end;
+        }
+    }
+    var size = 30 + Math.min(Math.round(Math.log(markers.length) * 4), 30);
+    return L.divIcon({
+        html: '<div style="width: ' + size + 'px; height: ' + size + 'px; ' +
+            'border-radius: 50%%; border: 1px solid #000000; ' +
+            'background: conic-gradient(' + stops.join(', ') + '); ' +
+            'display: flex; align-items: center; justify-content: center;">' +
+            '<span style="background: rgba(255, 255, 255, 0.8); ' +
+            'border-radius: 6px; padding: 0 3px; font-size: 11px;">' +
+            markers.length + '</span></div>',
+        className: 'lingtypology-cluster',
+        iconSize: L.point(size, size)
+    });
+}"""
+
+def _to_json(data):
+    """Compact JSON that is safe to put into <script>"""
+    return json.dumps(data, separators=(',', ':')).replace('</', '<\\/')
+
 class LingMap(object):
     """Lingtypology map object.
     
@@ -229,6 +370,9 @@ class LingMap(object):
         You can either use the 20 default colors(if None) or set yours(else).
     colormap_colors: tuple, default ('white', 'green')
         Colors for the colormap.
+    colormap_lut_size: int, default 256
+        Number of colors interpolated for the colormap. Colors of the markers
+        are taken from this lookup table.
     shapes: list of characters (str)
         If you use shapes instead of colors, you can either use the default shapes or set yours. Shapes are Unicode symbols.
     stroked: bool, default True
@@ -243,6 +387,26 @@ class LingMap(object):
         Position of LayerControls.
         
         May be 'topleft', 'topright', 'bottomleft' or 'bottomright'.
+    render_mode: str, default 'markers'
+        How to draw features and stroke features.
+
+        -   "markers": each language is one or several folium.CircleMarker.
+
+        -   "symbols": each language (with stroke or overlapping features
+            as well) is one marker with an SVG symbol of concentric circles.
+            It makes the HTML up to 4 times smaller, but circles of close
+            languages do not merge (see unstroked).
+
+        -   "geojson": all the languages are one GeoJSON layer drawn on
+            canvas. It makes the HTML much smaller and the map faster
+            for thousands of languages.
+
+        -   "cluster": close markers are grouped into clusters in the
+            browser (Leaflet.markercluster). Icons of the clusters show
+            proportions of the features. It is useful for dense data.
+
+        Shapes and LayerControls are not available in "geojson" and
+        "cluster" modes.
     """
     '''
     To understand how unstroked works looks see the example below.
@@ -337,11 +501,16 @@ class LingMap(object):
         self.control = False
         self.stroke_control = False
         self.control_position = 'topright'
+        # Rendering
+        self.render_mode = 'markers'
         # Colormap
         self.numeric = False
         self.s_numeric = False
         self.colormap_colors = ('white', 'green')
         self.stroke_colormap_colors = ('white', 'red')
+        self.colormap_scale = 'linear'
+        self.stroke_colormap_scale = 'linear'
+        self.colormap_lut_size = 256
         # Heat map
         self.use_heatmap = False
         self.heatmap = []
@@ -356,6 +525,9 @@ class LingMap(object):
         self.tooltips = None
         self.custom_coordinates = None
         self.stroke_features = None
+        self._factor = None
+        self._stroke_factor = None
+        self._coordinates_cache = None
         self.start_location_mapping = {
             'Central Europe': {'start_location': (50, 0), 'start_zoom': 4},
             'Caucasus': {'start_location': (43, 42), 'start_zoom': 6},
@@ -395,89 +567,114 @@ class LingMap(object):
                 ]
                 self.stroke_colors += new_colors
         
-    def _get_coordinates(self, language, i):
-        """Get coordinates either from:
+    def _resolve_coordinates(self):
+        """Get coordinates of all the languages either from:
             self.custom_coordinates or
             self.languages as language names or
             self.languages as glottocode.
-        
-        Parameters:
-        -----------
-        language: str
-            Either language name or glottocode.
-        i: int
-            Iteration of the cicle.
-        
-        Returns: tuple of two ints (coordinates).
+
+        Glottolog is queried once for all the languages. The result is
+        cached until self.languages, self.custom_coordinates or
+        self.glottocode change.
+
+        Returns: list of tuples of two numbers (None if not found).
         """
+        key = (
+            tuple(self.languages),
+            tuple(self.custom_coordinates) if self.custom_coordinates else None,
+            self.glottocode
+        )
+        if self._coordinates_cache and self._coordinates_cache[0] == key:
+            return self._coordinates_cache[1]
         if self.custom_coordinates:
-            coordinates = self.custom_coordinates[i]
+            coordinates = list(self.custom_coordinates)
+        elif self.glottocode:
+            coordinates = lingtypology.glottolog \
+                .get_coordinates_list_by_glot_ids(self.languages)
         else:
-            if self.glottocode:
-                coordinates = \
-                    lingtypology.glottolog.get_coordinates_by_glot_id(language)
-            else:
-                coordinates = \
-                    lingtypology.glottolog.get_coordinates(language)
-        if not coordinates \
-            or math.isnan(coordinates[0]) \
-            or math.isnan(coordinates[1]):
-            return
+            coordinates = \
+                lingtypology.glottolog.get_coordinates_list(self.languages)
+        coordinates = [
+            None \
+                if not c or math.isnan(c[0]) or math.isnan(c[1]) \
+                else c \
+            for c in coordinates
+        ]
+        self._coordinates_cache = (key, coordinates)
+        return coordinates
+
+    def _make_popups(self, parse_html=False):
+        """Makes contents of the popups for all the markers.
+
+        Glottolog is queried once for all the languages and the links
+        are formatted with vectorized string operations.
+
+        Parameters
+        ----------
+        parse_html: bool, default False
+            Whether to use Folium.IFrame to add content to the popup
+
+        Returns
+        ----------
+        list
+            Contents of the popups (str or None if there is no popup).
+        """
+        if not self.languages_in_popups:
+            if self.popups:
+                return list(self.popups)
+            return [None] * len(self.languages)
+        if self.popups and parse_html:
+            raise LingMapError(
+                'It is impossible to add both language links' \
+                'and large HTML strings.\n' \
+                'You can either not use html_popups option ' \
+                'or set ling_map_object.languages_in_popups = False.'
+            )
+        languages = pandas.Series(self.languages, dtype=object)
+        if self.glottocode:
+            links = languages
+            names = pandas.Series(
+                lingtypology.glottolog.get_by_glot_ids(self.languages),
+                dtype=object
+            )
         else:
-            return coordinates
+            links = pandas.Series(
+                lingtypology.glottolog.get_glot_ids(self.languages),
+                dtype=object
+            )
+            names = languages
+        links = links.fillna('').astype(str)
+        names = names.astype(str)
+        popups = \
+            '<a ' \
+                'href="https://glottolog.org/resource/languoid/id/' + links + '" ' \
+                '''onclick="this.target='_blank';"''' \
+            '>' + names + '</a>' \
+            '<br>'
+        popups = popups.where(links != '', names)
+        if self.popups:
+            popups += pandas.Series(self.popups, dtype=object).astype(str)
+        return popups.tolist()
 
-    def _create_popups(self, marker, language, i, parse_html=False):
+    def _create_popups(self, marker, popup, parse_html=False):
         """Creates popups.
 
         Parameters
         ----------
         marker: folium.CircleMarker
             Marker to add the popup to.
-        language: str
-            Language name.
-        i: int
-            Number of the marker.
+        popup: str or None
+            Content of the popup (see _make_popups).
         parse_html: bool, default False
             Whether to use Folium.IFrame to add content to the popup
         """
-        popup_href = \
-            '<a ' \
-                'href="https://glottolog.org/resource/languoid/id/{}" ' \
-                '''onclick="this.target='_blank';"''' \
-            '>' \
-                '{}'\
-            '</a>'\
-            '<br>'
-        href_link = lingtypology.glottolog.get_glot_id(language) \
-            if not self.glottocode \
-            else language
-        href_content = language \
-            if not self.glottocode \
-            else lingtypology.glottolog.get_by_glot_id(language)
-        popup_href = popup_href.format(href_link, href_content) \
-            if href_link \
-            else href_content
-        if self.languages_in_popups:
-            if self.popups:
-                if parse_html:
-                    raise LingMapError(
-                        'It is impossible to add both language links' \
-                        'and large HTML strings.\n' \
-                        'You can either not use html_popups option ' \
-                        'or set ling_map_object.languages_in_popups = False.'
-                    )
-                popup = folium.Popup(popup_href + self.popups[i])
-            else:
-                popup = folium.Popup(popup_href)
-            popup.add_to(marker)
+        if popup is None:
+            return
+        if parse_html and not self.languages_in_popups:
+            popup = folium.Popup(folium.IFrame(html=popup))
         else:
-            if self.popups:
-                if parse_html:
-                    iframe = folium.IFrame(html=self.popups[i])
-                    popup = folium.Popup(iframe)
-                else:
-                    popup = folium.Popup(self.popups[i])
-                popup.add_to(marker)
+            popup = folium.Popup(popup)
+        popup.add_to(marker)
 
     def _create_legend(self, m, legend_data, title='Legend', position='bottomright'):
         """Creates legend and adds it to the map
@@ -491,17 +688,11 @@ class LingMap(object):
         position: str, default 'bottomright'
             Legend position.
         """
-        with open(MODULE_DIRECTORY + 'legend.html', 'r', encoding='utf-8') as f:
-            template = f.read()
-        template = jinja2.Template(template)
-        template = template.render(
+        template = _get_template('legend.html').render(
             data=legend_data, position=position, title=title,
             use_shapes=self.use_shapes, legend_id=self._legend_id
         )
-        template = '{% macro html(this, kwargs) %}' + template + '{% endmacro %}'
-        macro = branca.element.MacroElement()
-        macro._template = branca.element.Template(template)
-        m.get_root().add_child(macro)
+        m.get_root().html.add_child(_Legend(template))
         self._legend_id += 1
 
     def _create_heatmap(self, m, heatmap):
@@ -522,15 +713,11 @@ class LingMap(object):
         title: str
             Title.
         """
-        with open(MODULE_DIRECTORY + 'legend.html', 'r', encoding='utf-8') as f:
-            template = f.read()
-        template = jinja2.Template(template)
-        template = template.render(position=position, title=title,
-                                   legend_id=self._legend_id, it_is_title=True)
-        template = '{% macro html(this, kwargs) %}' + template + '{% endmacro %}'
-        macro = branca.element.MacroElement()
-        macro._template = branca.element.Template(template)
-        m.get_root().add_child(macro)
+        template = _get_template('legend.html').render(
+            position=position, title=title,
+            legend_id=self._legend_id, it_is_title=True
+        )
+        m.get_root().html.add_child(_Legend(template))
         self._legend_id += 1
 
     def _set_marker(self,
@@ -580,68 +767,81 @@ class LingMap(object):
             )
         return marker
 
-    
-    def _sort_all(self, features):
-        """This crazy function is needed to sort everything by features.
 
-        It takes all necessary attributes and sorts them by features.
+    def _get_order(self, features, factor=None):
+        """Stable permutation that sorts the markers by features.
+
         Parameters
         ----------
-        features: str
-            List of features
+        features: list
+            Features.
+        factor: list-like, default None
+            Order of the features. If None, they are sorted by value
+            (as str in case of different types).
 
         Returns
         ----------
-        features: str
+        numpy.ndarray
+            Indices of the markers in the sorted order.
+        """
+        if factor is not None and len(factor):
+            codes = pandas.Index(list(dict.fromkeys(factor))) \
+                .get_indexer(list(features))
+            if (codes < 0).any():
+                raise LingMapError(
+                    'Features {} are not in the factor'.format(
+                        ', '.join(map(str, dict.fromkeys(
+                            f for f, c in zip(features, codes) if c < 0
+                        )))
+                    )
+                )
+            return numpy.argsort(codes, kind='stable')
+        try:
+            return numpy.argsort(
+                numpy.array(list(features)), kind='stable'
+            )
+        except TypeError:
+            #In case of different types, fall back to sorting as str
+            return numpy.argsort(
+                numpy.array([str(f) for f in features]), kind='stable'
+            )
+
+    @property
+    def all_attrs(self):
+        """Tuples of (feature, language, popup, tooltip, coordinates).
+
+        Missing attributes are False.
         """
-        def _sort_by_factor(l, f):
-            result = []
-            for fact in f:
-                for el in l:
-                    if el[0] == fact:
-                        result.append(el)
-            if not len(result) == len(l):
-                raise LingMapError('Something is wrong with the sorting')
-            return result
+        features = self.features or []
+        length = [False for n in range(len(features))]
         attrs = [self.languages, self.popups,
                  self.tooltips, self.custom_coordinates]
-        length = [False for n in range(len(features))]
-        attrs_r = []
-        for attr in attrs:
-            if attr:
-                attrs_r.append(attr)
-            else:
-                attrs_r.append(length)
-        self.all_attrs = list(zip(features, *attrs_r))
-        if self._factor:
-            al = _sort_by_factor(self.all_attrs, self._factor)
-        else:
-            try:
-                al = self.all_attrs.copy()
-                al.sort(key=lambda element: element[0])
-            except TypeError:
-                #In case of different types, fall back to sorting as str
-                al = list(zip(map(str, features), *attrs_r))
-                al.sort(key=lambda element: element[0])
-        features = []
-        self.languages = []
-        self.popups = []
-        self.tooltips = []
-        self.custom_coordinates = []
-        for el in al:
-            features.append(el[0])
-            if el[1]:
-                self.languages.append(el[1])
-            if el[2]:
-                self.popups.append(el[2])
-            if el[3]:
-                self.tooltips.append(el[3])
-            if el[4]:
-                self.custom_coordinates.append(el[4])
-        self.features = features
-        return features
-    
-    def _make_colormap(self, features, colormap_colors):
+        return list(zip(features, *[attr or length for attr in attrs]))
+
+    def _make_colormap(self, features, colormap_colors, scale='linear'):
+        """Creates legend for numeric features and colors of the markers.
+
+        Colors of the markers are taken from a lookup table
+        (self.colormap_lut_size colors interpolated once) indexed by
+        positions of the features on the scale.
+
+        Parameters
+        ----------
+        features: list of numbers
+            Features or stroke features.
+        colormap_colors: tuple
+            Colors for the colormap.
+        scale: str, default 'linear'
+            'linear', 'log' (features must be positive) or 'quantile'
+            (colors are distributed by ranks of the features).
+
+        Returns
+        ----------
+        data: str
+            HTML string of data for legend.
+        marker_colors: list of str
+            Color of each marker.
+        """
         def round_up(a, digits=0):
             if digits is None:
                 return a
@@ -664,65 +864,140 @@ class LingMap(object):
             elif n > 1 and isinstance(n, float):
                 return 0
             return None
-            
-        #Round features so that they look handsome
-        digits = how_round(features[-1])
-        minimum = round_down(features[0], digits)
-        maximum = round_up(features[-1], digits)
-        
+
+        values = numpy.array(features, dtype=float)
         colormap = branca.colormap.LinearColormap(
             colors = colormap_colors,
-            index = [minimum, maximum],
-            vmin = minimum,
-            vmax = maximum,
+            vmin = 0,
+            vmax = 1,
         )
-        
-        if isinstance(features[-1], int):
-            if features[-1] // 10 == 0:
-                step = 1
-                colormap_features = list(range(minimum, maximum)) + [maximum]
+        lut = numpy.array(
+            [colormap(p) for p in numpy.linspace(0, 1, self.colormap_lut_size)],
+            dtype=object
+        )
+
+        if scale == 'linear':
+            #Round features so that they look handsome
+            digits = how_round(max(features))
+            minimum = round_down(min(features), digits)
+            maximum = round_up(max(features), digits)
+            if isinstance(max(features), int):
+                if max(features) // 10 == 0:
+                    step = 1
+                    colormap_features = list(range(minimum, maximum)) + [maximum]
+                else:
+                    step = maximum // 10
+                    colormap_features = list(range(minimum, maximum, step))
             else:
-                step = maximum // 10
-                colormap_features = list(range(minimum, maximum, step))
-        else:
-            step = maximum / 10
-            colormap_features = list(_frange(minimum, maximum, step))
-
-        # Crazy stuff below draws SVGs with color gradient
-        groups_features = [(0, colormap(feature)) for feature in features]
-        color_data = ''
-        text = ''
-        i = 0
-        for ind, cf in enumerate(colormap_features):
-            color_data += '<line x1="0" y1="{pos}" x2="20" y2="{pos}"' \
-                'style="stroke:{color};stroke-width:3;" />'.format(
-                    pos=i, color=colormap(cf)
-                )
-            i += 1
-            if not ind == 0:
-                text += '<text x="5" y="{pos}" dx="0" dy="0ex">- {text}</text>'.format(
-                    pos=i, text=cf
+                step = maximum / 10
+                colormap_features = list(_frange(minimum, maximum, step))
+            if colormap_features \
+                and math.isclose(colormap_features[-1], maximum):
+                colormap_features[-1] = maximum
+            elif not colormap_features or colormap_features[-1] < maximum:
+                colormap_features.append(maximum)
+            width = (maximum - minimum) or 1
+            positions = (values - minimum) / width
+            ticks = [(cf - minimum) / width for cf in colormap_features]
+            labels = [
+                '{:.4g}'.format(cf) if isinstance(cf, float) else cf \
+                    for cf in colormap_features
+            ]
+        elif scale == 'log':
+            if (values <= 0).any():
+                raise LingMapError(
+                    'Features must be positive to use log scale'
                 )
-            if not ind + 1 == len(colormap_features):
-                gr = [
-                    colormap(f) \
-                        for f in _frange(
-                            cf, colormap_features[ind + 1], step / 20
-                        )
-                ][1:-2]
-                for c in gr:
-                    i += 1
-                    color_data += '<line x1="0" y1="{pos}" x2="20" y2="{pos}"' \
-                        'style="stroke:{color};stroke-width:3;" />'.format(
-                            pos=i, color=c
-                        )
-        
-        gradient_templ = '<svg height="' + str(i) + '" width="20">{}</svg>'
-        text_templ = '<svg height="' + str(i) + '" width="50">{}</svg>'
+            low = numpy.log(values.min())
+            width = (numpy.log(values.max()) - low) or 1
+            positions = (numpy.log(values) - low) / width
+            ticks = list(numpy.linspace(0, 1, 6))
+            labels = [
+                '{:.3g}'.format(math.exp(low + t * width)) for t in ticks
+            ]
+        elif scale == 'quantile':
+            ranks = pandas.Series(values).rank().to_numpy()
+            positions = (ranks - 1) / max(len(values) - 1, 1)
+            ticks = list(numpy.linspace(0, 1, 6))
+            labels = [
+                '{:.3g}'.format(q) for q in numpy.nanquantile(values, ticks)
+            ]
+        else:
+            raise LingMapError(
+                '{}: unknown scale.\n' \
+                'You can use "linear", "log" or "quantile"'.format(scale)
+            )
+        positions = numpy.where(numpy.isnan(positions), 0, positions)
+        index = numpy.rint(
+            numpy.clip(positions, 0, 1) * (len(lut) - 1)
+        ).astype(int)
+        marker_colors = lut[index].tolist()
+
+        # One SVG linearGradient with a stop for each color of the colormap
+        # and a label for each tick
+        gradient_id = 'lingtypology-gradient-{}'.format(next(_gradient_ids))
+        height = 18 * max(len(ticks) - 1, 1)
+        pad = 7
+        stops = ''.join(
+            '<stop offset="{:.4g}" stop-color="{}" stop-opacity="{:.3g}" />'.format(
+                position, colormap.rgb_hex_str(position),
+                colormap.rgba_floats_tuple(position)[3]
+            ) for position in colormap.index
+        )
+        text = ''.join(
+            '<text x="25" y="{:.1f}" dy="0.35em">- {}</text>'.format(
+                pad + tick * height, label
+            ) for tick, label in zip(ticks, labels)
+        )
         data = \
-            gradient_templ.format(color_data) + \
-            text_templ.format(text)
-        return data, groups_features
+            '<svg height="{height}" width="80">' \
+                '<defs>' \
+                    '<linearGradient id="{id}" x1="0" y1="0" x2="0" y2="1">' \
+                        '{stops}' \
+                    '</linearGradient>' \
+                '</defs>' \
+                '<rect x="0" y="{pad}" width="20" height="{gradient_height}" ' \
+                    'fill="url(#{id})" />' \
+                '{text}' \
+            '</svg>'.format(
+                height=height + 2 * pad, id=gradient_id, stops=stops,
+                pad=pad, gradient_height=height, text=text
+            )
+        return data, marker_colors
+
+    def _factorize(self, features, factor=None):
+        """Codes features as integers.
+
+        Parameters
+        ----------
+        features: list
+            Features.
+        factor: list-like, default None
+            Order of the categories. If None, they are ordered by
+            the first appearance.
+
+        Returns
+        ----------
+        codes: numpy.ndarray
+            Number of the category of each feature.
+        categories: list
+            Distinct features.
+        """
+        codes, categories = pandas.factorize(
+            pandas.Series(list(features), dtype=object)
+        )
+        categories = list(categories)
+        missing = codes < 0
+        if missing.any():
+            codes[missing] = len(categories)
+            categories.append(numpy.nan)
+        if factor is not None and len(factor):
+            order = self._get_order(categories, factor)
+            rank = numpy.empty_like(order)
+            rank[order] = numpy.arange(len(order))
+            codes = rank[codes]
+            categories = [categories[i] for i in order]
+        return codes, categories
 
     def _prepare_features(self, features, stroke=False, use_shapes=False):
         """Creates data for legend (depending on type of features) and creates features groups if needed
@@ -738,13 +1013,15 @@ class LingMap(object):
 
         Returns
         ----------
-        groups_features: tuple:
-            folium.map.FeatureGroup or 0
-                Feature group for the feature or 0 if it is not needed.
-            str
-                Color or shape.
-        data: str
-            HTML string of data for legend.
+        dict:
+            'colors': list
+                Color or shape of each marker.
+            'codes': numpy.ndarray or None
+                Number of the category of each marker (None if numeric).
+            'groups': list of folium.map.FeatureGroup
+                Feature group for each category (only if control is needed).
+            'data': str
+                HTML string of data for legend.
         """
         if use_shapes:
             colors = self.shapes
@@ -757,8 +1034,10 @@ class LingMap(object):
         colormap_colors = self.stroke_colormap_colors \
             if stroke \
             else self.colormap_colors
+        control = self.stroke_control if stroke else self.control
+        scale = self.stroke_colormap_scale if stroke else self.colormap_scale
+        factor = self._stroke_factor if stroke else self._factor
 
-        features = features if stroke else self._sort_all(features)
         if numeric:
             if not all(isinstance(f, int) or isinstance(f, float) for f in features):
                 try:
@@ -771,40 +1050,41 @@ class LingMap(object):
                 if isinstance(features[0], float):
                     if all(el.is_integer() for el in features):
                         features = [int(el) for el in features]
-            data, groups_features = \
-                self._make_colormap(features, colormap_colors)
-        else:
-            mapping = {}
-            clear_features = []
-            groups = []
-            data = []
-            for i, feature in enumerate(features):
-                if feature not in clear_features:
-                    clear_features.append(feature)
-                    groups.append(folium.FeatureGroup(name=features[i]))
-            for i, feature in enumerate(clear_features):
-                mapping[feature] = (groups[i], colors[i])
-                data.append((feature, colors[i]))
-            groups_features = [mapping[f] for f in features]
-            html = \
-                '<li>' \
-                    '<span ' \
-                        'style="' \
-                            'color: #000000; ' \
-                            'text-align: center; ' \
-                            'opacity:0.7; ' \
-                        '">\n' \
-                            '{}\n' \
-                    '</span>' \
-                        '{}' \
-                '</li>' \
-                    if use_shapes \
-                    else \
-                        '<li><span ' \
-                            'style="background: {};opacity:0.7;"' \
-                        '></span>{}</li>'
-            data = '\n'.join([html.format(d[1], d[0]) for d in data])
-        return (groups_features, data)
+            data, marker_colors = \
+                self._make_colormap(features, colormap_colors, scale)
+            return {'colors': marker_colors, 'codes': None,
+                    'groups': [], 'data': data}
+
+        codes, categories = self._factorize(features, factor)
+        palette = numpy.empty(len(categories), dtype=object)
+        palette[:] = colors[:len(categories)]
+        groups = [folium.FeatureGroup(name=category) \
+                      for category in categories] \
+            if control \
+            else []
+        html = \
+            '<li>' \
+                '<span ' \
+                    'style="' \
+                        'color: #000000; ' \
+                        'text-align: center; ' \
+                        'opacity:0.7; ' \
+                    '">\n' \
+                        '{}\n' \
+                '</span>' \
+                    '{}' \
+            '</li>' \
+                if use_shapes \
+                else \
+                    '<li><span ' \
+                        'style="background: {};opacity:0.7;"' \
+                    '></span>{}</li>'
+        data = '\n'.join(
+            html.format(color, category) \
+                for category, color in zip(categories, palette)
+        )
+        return {'colors': palette[codes].tolist(), 'codes': codes,
+                'groups': groups, 'data': data}
 
     def _create_unified_marker(self, coordinates, color_shape, s_color):
         """Creates several (<5, >0) markers that will look like one.
@@ -941,6 +1221,183 @@ class LingMap(object):
         return {'marker': marker, 'stroke': stroke,
                 's_marker': s_marker, 's_stroke': s_stroke}
     
+    def _get_rings(self, color, s_color):
+        """Circles that look like the markers of _create_unified_marker.
+
+        Parameters
+        ----------
+        color: str
+            Color.
+        s_color:
+            Stroke color. It is not used if there are no stroke features.
+
+        Returns
+        ----------
+        list of tuples
+            (radius, fill color, fill opacity, whether to draw outline)
+            from the outer circle to the inner one.
+        """
+        rings = []
+        if self.stroke_features:
+            if self.unstroked:
+                rings.append((self.stroke_radius * 1.12, '#000000',
+                              self.stroke_opacity, True))
+                rings.append((self.stroke_radius, s_color,
+                              self.stroke_opacity, False))
+                rings.append((self.radius * 1.15, '#000000',
+                              self.opacity, True))
+            else:
+                rings.append((self.stroke_radius, s_color,
+                              self.stroke_opacity, self.stroked))
+        elif self.unstroked:
+            rings.append((self.radius * 1.15, '#000000', self.opacity, True))
+        rings.append((self.radius, color, self.opacity,
+                      self.stroked and not self.unstroked))
+        return rings
+
+    def _create_symbol(self, coordinates, rings):
+        """Creates one marker with an SVG symbol of concentric circles.
+
+        Parameters
+        ----------
+        coordinates: tuple
+            Tuple of (latitude, longitude).
+        rings: list of tuples
+            (radius, fill color, fill opacity, whether to draw outline)
+            from the outer circle to the inner one.
+
+        Returns
+        ----------
+        marker: folium.Marker
+        """
+        size = math.ceil(2 * max(ring[0] for ring in rings) + 2)
+        center = size / 2
+        circles = ''.join(
+            '<circle cx="{c:g}" cy="{c:g}" r="{r:g}" fill="{fill}" ' \
+                'fill-opacity="{opacity:g}"{outline} />'.format(
+                    c=center, r=radius, fill=fill, opacity=opacity,
+                    outline=' stroke="#000000" stroke-width="1"' \
+                        if outline \
+                        else ''
+                ) for radius, fill, opacity, outline in rings
+        )
+        icon = folium.DivIcon(
+            html='<svg width="{0:g}" height="{0:g}">{1}</svg>'.format(
+                size, circles
+            ),
+            icon_size=(size, size),
+            icon_anchor=(center, center),
+            class_name='lingtypology-symbol'
+        )
+        return folium.Marker(
+            location=[coordinates[0], coordinates[1]], icon=icon
+        )
+
+    def _create_geojson(self, group, coordinates_list, popups, tooltips,
+                        prepared=None, s_prepared=None):
+        """Creates one GeoJSON layer with all the markers.
+
+        Each marker is a GeoJSON Feature with the color, the category
+        code and the popup and tooltip in the properties.
+
+        Parameters
+        ----------
+        group: folium.FeatureGroup
+            Group to add the layer to.
+        coordinates_list: list
+            Coordinates of the markers (None if not found).
+        popups: list
+            Contents of the popups.
+        tooltips: list or None
+            Tooltips.
+        prepared: dict, default None
+            Features (see _prepare_features).
+        s_prepared: dict, default None
+            Stroke features (see _prepare_features).
+        """
+        features = []
+        for i, coordinates in enumerate(coordinates_list):
+            if not coordinates:
+                continue
+            self.heatmap.append(coordinates)
+            properties = {
+                'color': prepared['colors'][i] if prepared else self.colors[0]
+            }
+            if prepared and prepared['codes'] is not None:
+                properties['code'] = int(prepared['codes'][i])
+            if s_prepared:
+                properties['s_color'] = s_prepared['colors'][i]
+            if popups[i] is not None:
+                properties['popup'] = str(popups[i])
+            if tooltips:
+                properties['tooltip'] = str(tooltips[i])
+            features.append({
+                'type': 'Feature',
+                'geometry': {
+                    'type': 'Point',
+                    'coordinates': [
+                        float(coordinates[1]), float(coordinates[0])
+                    ]
+                },
+                'properties': properties
+            })
+        options = {
+            'radius': self.radius,
+            'opacity': self.opacity,
+            'stroked': self.stroked,
+            'stroke_radius': self.stroke_radius,
+            'stroke_opacity': getattr(self, 'stroke_opacity', 1),
+        }
+        group.add_child(_GeoJsonLayer(
+            {'type': 'FeatureCollection', 'features': features}, options
+        ))
+
+    def _create_cluster(self, group, coordinates_list, popups, tooltips,
+                        prepared=None, s_prepared=None):
+        """Creates clusters of markers built in the browser.
+
+        The markers are passed as a data array to
+        folium.plugins.FastMarkerCluster. Icons of the clusters are pie
+        charts of the colors of the markers they contain.
+
+        Parameters are the same as of _create_geojson.
+        """
+        colors = prepared['colors'] \
+            if prepared \
+            else [self.colors[0]] * len(coordinates_list)
+        codes, palette = pandas.factorize(pandas.Series(colors, dtype=object))
+        if s_prepared:
+            s_codes, s_palette = pandas.factorize(
+                pandas.Series(s_prepared['colors'], dtype=object)
+            )
+        data = []
+        for i, coordinates in enumerate(coordinates_list):
+            if not coordinates:
+                continue
+            self.heatmap.append(coordinates)
+            data.append([
+                float(coordinates[0]), float(coordinates[1]), int(codes[i]),
+                None if popups[i] is None else str(popups[i]),
+                str(tooltips[i]) if tooltips else None,
+                int(s_codes[i]) if s_prepared else None
+            ])
+        options = {
+            'palette': list(palette),
+            's_palette': list(s_palette) if s_prepared else [],
+            'radius': self.radius,
+            'opacity': self.opacity,
+            'stroked': self.stroked,
+            'stroke_radius': self.stroke_radius,
+            'stroke_opacity': getattr(self, 'stroke_opacity', 1),
+        }
+        folium.plugins.FastMarkerCluster(
+            data,
+            callback=_cluster_callback % {'options': _to_json(options)},
+            icon_create_function=_cluster_icon % {
+                'palette': _to_json(list(palette))
+            }
+        ).add_to(group)
+
     def add_custom_coordinates(self, custom_coordinates):
         """Set custom coordinates.
 
@@ -964,7 +1421,7 @@ class LingMap(object):
     def add_features(self, features, radius=7,
                      opacity=1, colors=None,
                      numeric=False, control=False,
-                     use_shapes=False, factor=None):
+                     use_shapes=False, factor=None, scale='linear'):
         """Add features.
         
         Parameters
@@ -1008,6 +1465,10 @@ class LingMap(object):
             they will be included into the legend with the following order:
             a, b, c. If you pass ('b', 'a', 'c') as factor, they will be
             included into the legend this way.
+        scale: str, default 'linear'
+            Scale of the colormap (numeric features only): 'linear', 'log'
+            or 'quantile'. Use 'log' for skewed positive features and
+            'quantile' to distribute colors by ranks of the features.
         """
         features = tuple(features)
         self._sanity_check(features, feature_name='features')
@@ -1019,13 +1480,14 @@ class LingMap(object):
         
         self._factor = factor
         self.numeric = numeric
+        self.colormap_scale = scale
         self.control = control
         self.use_shapes = use_shapes
 
     def add_stroke_features(self, features, radius=12,
                             opacity=1, colors=None,
                             numeric=False, control=False,
-                            factor=None):
+                            factor=None, scale='linear'):
         """Add stroke features.
 
         This function assigns features to strokes of markers.
@@ -1049,6 +1511,12 @@ class LingMap(object):
         control: bool, default False
             Whether to add LayerControls to the map.
             It allows interactive turning on/off given features.
+        factor: list-like, default None
+            Order of the stroke features in the legend. Unless it is
+            specified, they are included in order of appearance.
+        scale: str, default 'linear'
+            Scale of the colormap (numeric stroke features only): 'linear',
+            'log' or 'quantile'.
         """
         features = tuple(features)
         self._sanity_check(features, feature_name='stroke features')
@@ -1058,8 +1526,9 @@ class LingMap(object):
         if colors:
             self.stroke_colors = colors
         
-        self._factor = factor
+        self._stroke_factor = factor
         self.s_numeric = numeric
+        self.stroke_colormap_scale = scale
         self.stroke_control = control
     
     def add_overlapping_features(self, marker_groups,
@@ -1341,17 +1810,24 @@ class LingMap(object):
                 * Set markers, popups and tooltips.
             * Create legend.
             {{ third ending }}
+        * Get the order of markers sorted by features (_get_order). Languages,
+            features, coordinates, popups and tooltips are permuted copies,
+            the attributes are not changed.
         * If features are given, prepare them (_prepare_features). This includes:
-            * Creating folium.FeatureGroup.
+            * Coding features as integers (_factorize).
+            * Creating folium.FeatureGroup for each category (if control is on).
             * Creating data for legend.
-            * Storing info on features as list of tuples (len = 2)
-                * The first element: color (HEX) of shape (Unicode)
-                * The second element: folium.FeatureGroup
+            * Storing color (HEX) or shape (Unicode) of each marker.
         * If stroke features are given, prepare them as well.
+        * If render_mode is 'geojson', put all the markers into one GeoJSON
+            layer (_create_geojson) instead of the walk below. If it is
+            'cluster', pass them as data for clusters (_create_cluster).
         * Walk in languages:
             * Apply custom coordinates or the ones from Glottolog.
             * Create unified marker using:
                 coordinates, color/shape for features and color for stroke features.
+                If render_mode is 'symbols', it is one marker with concentric
+                circles instead (_get_rings and _create_symbol).
                 Unified marker is a dict that consists of information necessary
                 to draw 1-4 markers (more look in docstring for _create_unified_marker.
             * Create popup for the marker (_create_popups method).
@@ -1369,7 +1845,19 @@ class LingMap(object):
         {{true ending}}
         '''
         self._check_and_generate_colors()
-        
+        if self.render_mode not in ('markers', 'symbols', 'geojson', 'cluster'):
+            raise LingMapError(
+                '{}: unknown render mode.\n' \
+                'You can use "markers", "symbols", "geojson" ' \
+                'or "cluster"'.format(self.render_mode)
+            )
+        if self.render_mode in ('geojson', 'cluster') \
+            and (self.use_shapes or self.control or self.stroke_control):
+            raise LingMapError(
+                'Shapes and LayerControls are not available ' \
+                'in {} render mode'.format(self.render_mode)
+            )
+
         if isinstance(self.start_location, str):
             if not self.start_location in self.start_location_mapping:
                 raise LingMapError(
@@ -1419,13 +1907,15 @@ class LingMap(object):
 
         if self.minicharts:
             #we'll draw minicharts separately
+            coordinates_list = self._resolve_coordinates()
+            popups = self._make_popups(parse_html=self.html_popups)
             for i, language in enumerate(self.languages):
-                coordinates = self._get_coordinates(language, i)
+                coordinates = coordinates_list[i]
                 if not coordinates:
                     continue
                 marker = folium.Marker(coordinates, self.minicharts[i])
 
-                self._create_popups(marker, language, i,
+                self._create_popups(marker, popups[i],
                                     parse_html=self.html_popups)
                 if self.tooltips:
                     tooltip = folium.Tooltip(self.tooltips[i])
@@ -1460,8 +1950,10 @@ class LingMap(object):
                             color_mapping[feat] = self.colors[i]
                             i += 1
 
+            coordinates_list = self._resolve_coordinates()
+            popups = self._make_popups(parse_html=self.html_popups)
             for i, language in enumerate(self.languages):
-                coordinates = self._get_coordinates(language, i)
+                coordinates = coordinates_list[i]
                 if not coordinates:
                     continue
                 
@@ -1470,17 +1962,28 @@ class LingMap(object):
                 else:
                     radius = len(self.marker_groups[i]) * self.radius_increment
                 
-                for marker_data in self.marker_groups[i]:
-                    marker = self._set_marker(
-                        coordinates, stroke=self.stroked, radius=radius,
-                        fill_opacity=self.opacity,
-                        fill_color=color_mapping[marker_data]
-                    )
-                    radius -= self.radius_increment
+                if self.render_mode == 'symbols':
+                    rings = []
+                    for marker_data in self.marker_groups[i]:
+                        rings.append((radius, color_mapping[marker_data],
+                                      self.opacity, self.stroked))
+                        radius -= self.radius_increment
+                    symbols = [self._create_symbol(coordinates, rings)]
+                else:
+                    symbols = []
+                    for marker_data in self.marker_groups[i]:
+                        symbols.append(self._set_marker(
+                            coordinates, stroke=self.stroked, radius=radius,
+                            fill_opacity=self.opacity,
+                            fill_color=color_mapping[marker_data]
+                        ))
+                        radius -= self.radius_increment
+
+                for marker in symbols:
                     if self.tooltips:
                         tooltip = folium.Tooltip(self.tooltips[i])
                         tooltip.add_to(marker)
-                    self._create_popups(marker, language, i,
+                    self._create_popups(marker, popups[i],
                                         parse_html=self.html_popups)
                     markers.append(marker)
 
@@ -1499,95 +2002,127 @@ class LingMap(object):
                                     position=self.legend_position)
             return m
 
+        #Markers are drawn (and legends are made) sorted by features
+        order = self._get_order(self.features, self._factor) \
+            if self.features \
+            else numpy.arange(len(self.languages))
+        def permute(values):
+            return [values[i] for i in order] if values else None
+
         if self.features:
             prepared = self._prepare_features(
-                self.features, use_shapes=self.use_shapes
+                permute(self.features), use_shapes=self.use_shapes
             )
-            groups_features = prepared[0]
-            data = prepared[1]
 
         if self.stroke_features:
-            prepared = self._prepare_features(
-                self.stroke_features, stroke=True, use_shapes=self.use_shapes
+            s_prepared = self._prepare_features(
+                permute(self.stroke_features),
+                stroke=True, use_shapes=self.use_shapes
             )
-            s_groups_features = prepared[0]
-            s_data = prepared[1]
 
-        for i, language in enumerate(self.languages):
-            stroke_marker = False
-            coordinates = self._get_coordinates(language, i)
-            if not coordinates:
-                continue
+        languages = permute(self.languages)
+        coordinates_list = permute(self._resolve_coordinates())
+        popups = permute(self._make_popups(parse_html=self.html_popups))
+        tooltips = permute(self.tooltips)
+        if self.render_mode == 'geojson':
+            self._create_geojson(
+                default_group, coordinates_list, popups, tooltips,
+                prepared if self.features else None,
+                s_prepared if self.stroke_features else None
+            )
+        elif self.render_mode == 'cluster':
+            self._create_cluster(
+                default_group, coordinates_list, popups, tooltips,
+                prepared if self.features else None,
+                s_prepared if self.stroke_features else None
+            )
+        else:
+            for i, language in enumerate(languages):
+                stroke_marker = False
+                coordinates = coordinates_list[i]
+                if not coordinates:
+                    continue
             
-            self.heatmap.append(coordinates)
+                self.heatmap.append(coordinates)
             
-            color_shape = groups_features[i][1] \
-                if self.features \
-                else self.colors[0]
+                color_shape = prepared['colors'][i] \
+                    if self.features \
+                    else self.colors[0]
             
-            s_color = s_groups_features[i][1] \
-                if self.stroke_features \
-                else self.stroke_colors[0]
+                s_color = s_prepared['colors'][i] \
+                    if self.stroke_features \
+                    else self.stroke_colors[0]
                 
-            unified_marker = \
-                self._create_unified_marker(
-                    coordinates, color_shape, s_color
-                )
+                if self.render_mode == 'symbols' \
+                    and not (self.use_shapes and not self.stroke_features):
+                    unified_marker = {
+                        'marker': self._create_symbol(
+                            coordinates, self._get_rings(color_shape, s_color)
+                        ),
+                        'stroke': '', 's_marker': '', 's_stroke': ''
+                    }
+                else:
+                    unified_marker = \
+                        self._create_unified_marker(
+                            coordinates, color_shape, s_color
+                        )
             
-            self._create_popups(
-                unified_marker['marker'], language,
-                i, parse_html=self.html_popups
-            )
+                self._create_popups(
+                    unified_marker['marker'], popups[i],
+                    parse_html=self.html_popups
+                )
 
-            if self.features and not self.numeric and self.control:
-                group = groups_features[i][0]
-            elif self.stroke_features and self.stroke_control:
-                group = s_groups_features[i][0]
-            else:
-                group = default_group
+                if self.features and not self.numeric and self.control:
+                    group = prepared['groups'][prepared['codes'][i]]
+                elif self.stroke_features and self.stroke_control \
+                    and not self.s_numeric:
+                    group = s_prepared['groups'][s_prepared['codes'][i]]
+                else:
+                    group = default_group
                 
-            if self.tooltips:
-                tooltip = folium.Tooltip(self.tooltips[i])
-                tooltip.add_to(unified_marker['marker'])
-
-            markers.append((unified_marker['marker'], group))
-            if unified_marker['stroke']:
-                strokes.append((unified_marker['stroke'], group))
-            if unified_marker['s_marker']:
-                s_markers.append((unified_marker['s_marker'], group))
-            if unified_marker['s_stroke']:
-                s_strokes.append((unified_marker['s_stroke'], group))
-
-        #This order is important
-        if s_strokes:
-            collections.deque((s_stroke[0].add_to(s_stroke[1]) for s_stroke in s_strokes))
-        if s_markers:
-            collections.deque((s_mark[0].add_to(s_mark[1]) for s_mark in s_markers))
-        if strokes:
-            collections.deque((stroke[0].add_to(stroke[1]) for stroke in strokes))
-        collections.deque((mark[0].add_to(mark[1]) for mark in markers))
+                if tooltips:
+                    tooltip = folium.Tooltip(tooltips[i])
+                    tooltip.add_to(unified_marker['marker'])
+
+                markers.append((unified_marker['marker'], group))
+                if unified_marker['stroke']:
+                    strokes.append((unified_marker['stroke'], group))
+                if unified_marker['s_marker']:
+                    s_markers.append((unified_marker['s_marker'], group))
+                if unified_marker['s_stroke']:
+                    s_strokes.append((unified_marker['s_stroke'], group))
+
+            #This order is important
+            if s_strokes:
+                collections.deque((s_stroke[0].add_to(s_stroke[1]) for s_stroke in s_strokes))
+            if s_markers:
+                collections.deque((s_mark[0].add_to(s_mark[1]) for s_mark in s_markers))
+            if strokes:
+                collections.deque((stroke[0].add_to(stroke[1]) for stroke in strokes))
+            collections.deque((mark[0].add_to(mark[1]) for mark in markers))
         
         if self.features:
             if self.numeric or self.s_numeric:
                 m.add_child(default_group)
                 if self.numeric:
-                    self._create_legend(m, data, title=self.legend_title,
+                    self._create_legend(m, prepared['data'],
+                                        title=self.legend_title,
                                         position=self.legend_position)
                 if self.s_numeric:
                     self._create_legend(
-                        m, s_data,
+                        m, s_prepared['data'],
                         title=self.stroke_legend_title,
                         position=self.stroke_legend_position,
                     )
             else:
                 if self.control:
-                    collections.deque((m.add_child(fg[0]) for fg in groups_features))
+                    collections.deque(map(m.add_child, prepared['groups']))
                     folium.LayerControl(
                         collapsed=False,
                         position=self.control_position
                     ).add_to(m)
                 elif self.stroke_control:
-                    collections.deque((m.add_child(fg[0]) for fg in s_groups_features))
+                    collections.deque(map(m.add_child, s_prepared['groups']))
                     folium.LayerControl(
                         collapsed=False,
                         position=self.control_position
@@ -1597,12 +2132,12 @@ class LingMap(object):
                 
                 if self.legend:
                     self._create_legend(
-                        m, data, title=self.legend_title,
+                        m, prepared['data'], title=self.legend_title,
                         position=self.legend_position
                     )
                 if self.stroke_features and self.stroke_legend:
                     self._create_legend(
-                        m, s_data, title=self.stroke_legend_title,
+                        m, s_prepared['data'], title=self.stroke_legend_title,
                         position=self.stroke_legend_position
                     )
         else:
@@ -1621,23 +2156,6 @@ class LingMap(object):
                     )
                 )
             )
-        #Needed for non-destructive sorting
-        if hasattr(self, 'all_attrs'):
-            self.features = []
-            self.languages = []
-            self.popups = []
-            self.tooltips = []
-            self.custom_coordinates = []
-            for el in self.all_attrs:
-                self.features.append(el[0])
-                if el[1]:
-                    self.languages.append(el[1])
-                if el[2]:
-                    self.popups.append(el[2])
-                if el[3]:
-                    self.tooltips.append(el[3])
-                if el[4]:
-                    self.custom_coordinates.append(el[4])
         return m
 
     def save(self, path):
@@ -41,12 +41,23 @@ setup(
           'matplotlib',
           'selenium'
     ],
+    entry_points={
+        'console_scripts': [
+            'lingtypology-fetch=lingtypology.fetch:main',
+        ],
+    },
     extras_require={
         'test': [
             'pytest>=3.6',
             'pytest-cov',
             'coverage>=4.2',
         ],
+        'async': [
+            'aiohttp',
+        ],
+        'sparse': [
+            'scipy',
+        ],
     },
     classifiers=[
         'Programming Language :: Python :: 3',
@@ -1,7 +1,14 @@
 import os
+import json
+import asyncio
+import threading
+import concurrent.futures
+import http.server
 from operator import itemgetter
 
+import numpy
 import pandas
+import requests
 from lingtypology import *
 
 import pytest
@@ -14,6 +21,34 @@ def circassian():
         delimiter=',',
         header=0)
 
+
+@pytest.fixture
+def wals_server():
+    """Local server that pretends to be WALS"""
+    page = \
+        'Citation\n\n\n\n\n' \
+        'wals code\tname\tvalue\tdescription\tlatitude\tlongitude\t' \
+            'genus\tfamily\tarea\n' \
+        'rus\tRussian\t2\tModerately small\t59.0\t50.0\t' \
+            'Slavic\tIndo-European\tEurasia\n'
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.headers.get('If-None-Match') == '"v1"':
+                self.send_response(304)
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header('ETag', '"v1"')
+            self.end_headers()
+            self.wfile.write(page.encode('utf-8'))
+        def log_message(self, *args):
+            pass
+    server = http.server.HTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield 'http://127.0.0.1:{}/{{}}.tab'.format(server.server_port)
+    server.shutdown()
+
+
 @pytest.fixture
 def ejective_and_n_consonants():
     return pandas.read_csv(
@@ -23,12 +58,14 @@ def ejective_and_n_consonants():
         delimiter=',',
         header=0)
 
+
 def test_LingMap(tmpdir):
     """The most basic test for LingMap"""
     m = LingMap(('Romanian', 'Ukrainian'))
     m.title = 'Simplest Test'
     m.save(str(tmpdir.join('simplest_test.html')))
 
+
 def test_LingMap_features1(circassian):
     """LingMap with features (normal + stroke)"""
     coordinates = zip(list(circassian.latitude), list(circassian.longitude))
@@ -55,7 +92,8 @@ def test_LingMap_features1(circassian):
     m.legend_title = 'Dialects'
     m.title = 'Circassian Dialects'
     m.render()
-    
+
+
 def test_LingMap_features2(ejective_and_n_consonants):
     """LingMap with features (colormap)"""
     data = ejective_and_n_consonants
@@ -69,6 +107,87 @@ def test_LingMap_features2(ejective_and_n_consonants):
     m.add_stroke_features(data.vowels, numeric = True)
     m.create_map()
 
+
+def test_LingMap_colormap():
+    m = LingMap(('Russian', 'English', 'Polish'))
+    data, colors = m._make_colormap([0, 10, 100], ('white', 'green'))
+    assert colors[0] == '#ffffffff' and colors[-1] == '#008000ff'
+    assert data.count('<stop ') == 2 and '<line ' not in data
+    assert '- 0<' in data and '- 100<' in data
+    data, colors = m._make_colormap(
+        [1, 10, 100], ('white', 'green'), scale='log'
+    )
+    assert colors[1] == m._make_colormap(
+        [1, 2, 3], ('white', 'green'), scale='quantile'
+    )[1][1]
+    m.add_features([1, 10, 100], numeric=True, scale='log')
+    m.create_map()
+
+
+def test_LingMap_legend_template():
+    m = LingMap(('Russian', 'English'))
+    m.title = 'Title {{ not jinja }}'
+    m.add_features(('a', 'b'))
+    html = m.render()
+    template = lingtypology.maps._templates['legend.html']
+    assert 'Title {{ not jinja }}' in html and "id='maplegend1'" in html
+    m.render()
+    assert lingtypology.maps._templates['legend.html'] is template
+
+
+def test_LingMap_geojson(circassian):
+    m = LingMap(circassian.language)
+    m.add_features(circassian.dialect)
+    m.add_stroke_features(circassian.language)
+    m.add_popups(circassian.village)
+    m.add_custom_coordinates(
+        zip(list(circassian.latitude), list(circassian.longitude))
+    )
+    m.render_mode = 'geojson'
+    html = m.render()
+    assert html.count('L.geoJson(') == 1 and 'var circle_marker_' not in html
+    assert html.count('"type":"Feature"') == len(circassian)
+    m.control = True
+    try:
+        m.create_map()
+    except lingtypology_exceptions.LingMapError:
+        pass
+    else:
+        raise(lingtypology_exceptions.LingMapError('The error did not rise!'))
+
+
+def test_LingMap_cluster(circassian):
+    m = LingMap(circassian.language)
+    m.add_features(circassian.dialect)
+    m.add_custom_coordinates(
+        zip(list(circassian.latitude), list(circassian.longitude))
+    )
+    m.render_mode = 'cluster'
+    html = m.render()
+    assert 'L.markerClusterGroup(' in html and 'conic-gradient' in html
+    assert 'var circle_marker_' not in html and "id='maplegend0'" in html
+
+
+def test_LingMap_symbols(circassian):
+    m = LingMap(circassian.language)
+    m.add_features(circassian.dialect)
+    m.add_stroke_features(circassian.language)
+    m.add_custom_coordinates(
+        zip(list(circassian.latitude), list(circassian.longitude))
+    )
+    m.render_mode = 'symbols'
+    html = m.render()
+    assert html.count('lingtypology-symbol') == len(circassian)
+    circle = 'circle cx='
+    assert html.count(circle) == 4 * len(circassian)
+    assert 'var circle_marker_' not in html
+
+    m = lingtypology.LingMap(('Tsakhur', 'Russian'))
+    m.add_overlapping_features([['ergative', 'has cases'], ['has cases']])
+    m.render_mode = 'symbols'
+    assert m.render().count(circle) == 3
+
+
 def test_LingMap_features3():
     """LingMap with features (shapes + control)"""
     languages = ["Adyghe", "Kabardian", "Polish", "Russian", "Bulgarian"]
@@ -88,6 +207,7 @@ def test_LingMap_features3():
     m.add_features(features, use_shapes=True, control=True)
     m.create_map()
 
+
 def test_LingMap_features4():
     languages = ["Adyghe", "Kabardian", "Polish", "Russian", "Bulgarian"]
     features = ["Agglutinative", "Agglutinative",
@@ -103,6 +223,7 @@ def test_LingMap_features4():
     m.add_features(features, factor=["Inflected", 'Analytic', 'Agglutinative'])
     m.create_map()
 
+
 def test_LingMap_overlapping_features():
     languages = ('Tsakhur', 'Russian', 'Bulgarian')
     m = lingtypology.LingMap(languages)
@@ -113,22 +234,26 @@ def test_LingMap_overlapping_features():
     ])
     m.create_map()
 
+
 def test_LingMap_minicharts(ejective_and_n_consonants):
     data = ejective_and_n_consonants
     
     m = lingtypology.LingMap(data.language)
     m.add_minicharts(data.consonants, data.vowels)
     m.create_map()
-    
+
+
 def test_LingMap_empty():
     """It has to work, lol"""
     LingMap().create_map()
 
+
 def test_LingMap_merge():
     m1 = LingMap('Russian')
     m2 = LingMap('English')
     merge(m1, m2).create_map()
 
+
 def test_LingMap_stroke_features_after_rendered():
     languages = ["Adyghe", "Kabardian", "Polish", "Russian", "Bulgarian"]
     features = ["Agglutinative", "Agglutinative", "Inflected", "Inflected", "Analytic"]
@@ -140,6 +265,7 @@ def test_LingMap_stroke_features_after_rendered():
     features_after = list(map(itemgetter(0), m.all_attrs))
     assert features_after == features
 
+
 def test_LingMapError():
     try:
         m = lingtypology.LingMap('Russian')
@@ -149,6 +275,51 @@ def test_LingMapError():
     else:
         raise(lingtypology_exceptions.LingMapError('The error did not rise!'))
 
+
+def test_LingMap_coordinates():
+    m = lingtypology.LingMap(('Russian', 'No such language'))
+    coordinates = m._resolve_coordinates()
+    assert coordinates == [glottolog.get_coordinates('Russian'), None]
+    assert m._resolve_coordinates() is coordinates
+    m.add_custom_coordinates([(1, 2), (3, float('nan'))])
+    assert m._resolve_coordinates() == [(1, 2), None]
+
+
+def test_LingMap_popups():
+    m = lingtypology.LingMap(('Russian', 'No such language'))
+    m.add_popups(('Moscow', 'Nowhere'))
+    popups = m._make_popups()
+    assert popups[0].startswith(
+        '<a href="https://glottolog.org/resource/languoid/id/russ1263"'
+    )
+    assert popups[0].endswith('>Russian</a><br>Moscow')
+    assert popups[1] == 'No such languageNowhere'
+
+
+def test_LingMap_sorting():
+    languages = ('Adyghe', 'Kabardian', 'Polish', 'Russian', 'Bulgarian')
+    features = ('b', 'a', 'c', 'a', 'b')
+    m = lingtypology.LingMap(languages)
+    assert list(m._get_order(features)) == [1, 3, 0, 4, 2]
+    assert list(m._get_order(features, factor=['c', 'b', 'a'])) == \
+        [2, 0, 4, 1, 3]
+    assert list(m._get_order((2, 'a', 1))) == [2, 0, 1]
+    m.add_features(features, factor=['c', 'b', 'a'])
+    m.add_stroke_features(languages)
+    m.create_map()
+    assert m.languages == languages and m.features == features
+    codes, categories = m._factorize(('b', 'a', 'b', None))
+    assert list(codes) == [0, 1, 0, 2] and categories[:2] == ['b', 'a']
+    codes, categories = m._factorize(features, factor=['c', 'b', 'a'])
+    assert list(codes) == [1, 2, 0, 2, 1] and categories == ['c', 'b', 'a']
+    try:
+        m._get_order(features, factor=['a', 'b'])
+    except lingtypology_exceptions.LingMapError:
+        pass
+    else:
+        raise(lingtypology_exceptions.LingMapError('The error did not rise!'))
+
+
 def test_Glottolog():
     languages = set()
     glottocodes = set()
@@ -185,6 +356,94 @@ def test_Glottolog():
         macroarea == macroarea_ex
     assert assertion
 
+
+def test_Glottolog_batch():
+    assert glottolog.get_glot_ids(['Russian', 'No such language']) == \
+        ['russ1263', None]
+    assert glottolog.get_glot_ids_by_iso(['rus']) == ['russ1263']
+    assert glottolog.get_by_glot_ids(['russ1263']) == ['Russian']
+    assert glottolog.get_coordinates_list(['Russian', 'No such language']) \
+        == [glottolog.get_coordinates('Russian'), None]
+    assert glottolog.get_coordinates_list_by_glot_ids(['russ1263']) == \
+        [glottolog.get_coordinates_by_glot_id('russ1263')]
+
+
+def test_join():
+    wals = pandas.DataFrame({'language': ['Russian', 'English'], '_1A': ['a', 'b']})
+    wals.attrs['dataset'] = 'wals'
+    phoible = pandas.DataFrame({
+        'glottocode': ['russ1263', 'russ1263'],
+        'vowels': [5, 6],
+    })
+    phoible.attrs['dataset'] = 'phoible'
+    joined = datasets.join(wals, phoible, how='inner')
+    assert list(joined.index) == ['russ1263']
+    assert list(joined.columns) == ['language', 'wals:language', 'wals:_1A', 'phoible:vowels']
+    assert joined.loc['russ1263', 'phoible:vowels'] == 5
+    assert len(datasets.join(wals, phoible)) == 2
+
+
+def test_join_iso():
+    phoible = pandas.DataFrame({
+        'ISO6393': ['rus', 'eng', None],
+        'language': ['Russkiy', 'English', 'Russian'],
+        'vowels': [5, 13, 6],
+    })
+    phoible.attrs['dataset'] = 'phoible'
+    joined = datasets.join(phoible)
+    assert list(joined.index) == ['russ1263', 'stan1293']
+    assert joined['phoible:vowels'].tolist() == [5, 13]
+
+    class Empty(object):
+        def get_df(self):
+            return None
+
+    assert datasets.join(Empty(), phoible).equals(joined)
+
+
+def test_coverage():
+    wals = pandas.DataFrame({
+        'language': ['Russian', 'English'],
+        '_1A': ['1. Small', '~N/A~'],
+        '_2A': ['1. Small', '2. Large'],
+    })
+    wals.attrs.update(dataset='wals', features=['_1A', '_2A'])
+    coverage = datasets.Coverage(wals)
+    assert coverage.matrix.shape == (2, 2)
+    assert list(coverage.get_languages(threshold=1.0)) == ['russ1263']
+    assert list(coverage.get_languages(threshold=0.5)) == ['russ1263', 'stan1293']
+    assert coverage.select(features=['wals:_1A']).matrix.sum() == 1
+    sails = pandas.DataFrame({
+        'glottocode': ['stan1293', 'russ1263', 'russ1263'],
+        'ICU1': ['1', None, None],
+    })
+    sails.attrs.update(dataset='sails', features=['ICU1'])
+    coverage.add(sails)
+    assert coverage.matrix.tolist() == [[True, True, False], [False, True, True]]
+    assert coverage._bits.shape == (2, 1)
+    assert coverage.share().tolist() == [2 / 3, 2 / 3]
+
+
+def test_associations():
+    df = pandas.DataFrame({
+        'family': ['A', 'A', 'B', 'B', 'B', 'C'],
+        '_1A_num': [1, 1, 2, 2, 1, None],
+        '_2A_num': [3, 3, 4, 4, 3, 4],
+        '_3A_num': [1, 2, 1, 2, 1, 2],
+    })
+    table = associations.contingency_table(df, '1A', '2A')
+    assert table.loc[1, 3] == 3 and table.loc[2, 4] == 2 and table.loc[1, 4] == 0
+    result = associations.get_associations(df, stratify_by='family')
+    assert list(zip(result.feature1, result.feature2)) == \
+        [('1A', '2A'), ('1A', '3A'), ('2A', '3A')]
+    #Family C has one language: it is left out of the counts
+    assert result.languages.tolist() == [5, 5, 5]
+    result = associations.get_associations(df)
+    assert result.languages.tolist() == [5, 5, 6]
+    v = associations.cramers_v(df, processes=2)
+    assert v.loc['1A', '2A'] == v.loc['2A', '1A'] == 1.0
+
+
 @pytest.mark.parametrize(
     'tables',
     [
@@ -192,21 +451,439 @@ def test_Glottolog():
         ('1a', '2a'),
     ],
 )
+
+
 def test_wals(tables):
     datasets.Wals(*tables).get_df(join_how='outer')
 
+
+def test_wals_coordinates():
+    wals = datasets.Wals('1a', '2a')
+    wals.coordinates_dtype = 'float32'
+    df = wals.get_df(join_how='outer')
+    assert df.latitude.dtype == 'float32'
+    assert df.wals_code.is_unique
+    assert df.coordinates.iloc[0] == (df.latitude.iloc[0], df.longitude.iloc[0])
+
+
+def test_wals_export(tmpdir):
+    wals = datasets.Wals('1a')
+    wals.show_citation = False
+    path = str(tmpdir.join('wals.json'))
+    wals.to_json(path)
+    with open(path, encoding='utf-8') as f:
+        js = json.load(f)
+    assert list(js) == list(wals.get_json())
+    path = str(tmpdir.join('wals.ndjson'))
+    wals.to_ndjson(path, chunksize=100)
+    with open(path, encoding='utf-8') as f:
+        assert len(f.readlines()) == len(js['wals_code'])
+
+
+def test_export_empty(tmpdir):
+    autotyp = datasets.Autotyp()
+    path = str(tmpdir.join('autotyp.json'))
+    with pytest.warns(UserWarning, match='No tables given'):
+        autotyp.to_json(path)
+    with open(path, encoding='utf-8') as f:
+        assert json.load(f) == {}
+    path = str(tmpdir.join('autotyp.ndjson'))
+    with pytest.warns(UserWarning, match='No tables given'):
+        autotyp.to_ndjson(path)
+    with open(path, encoding='utf-8') as f:
+        assert f.read() == ''
+
+
+def test_session(wals_server, monkeypatch):
+    monkeypatch.setitem(datasets.urls, 'wals', wals_server)
+    datasets.set_session(timeout=5, retries=0)
+    try:
+        df = datasets.Wals('1a').get_df()
+    finally:
+        datasets.set_session()
+    assert list(df.wals_code) == ['rus']
+
+
+def test_async(wals_server, monkeypatch):
+    monkeypatch.setitem(datasets.urls, 'wals', wals_server)
+    async def get_all():
+        return await asyncio.gather(
+            datasets.Wals('1a').aget_df(),
+            datasets.Wals('1a', '2a').aget_json(),
+        )
+    df, js = asyncio.run(get_all())
+    assert list(df.wals_code) == js['wals_code'] == ['rus']
+
+
+def test_async_load(monkeypatch):
+    import time
+    content = b'Glottocode,Phoneme\nrussian1263,a\n'
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def do_HEAD(self):
+            self.send_response(200)
+            self.send_header('Content-Length', str(len(content)))
+            self.end_headers()
+        def do_GET(self):
+            self.do_HEAD()
+            self.wfile.write(content)
+        def log_message(self, *args):
+            pass
+    server = http.server.HTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    monkeypatch.setitem(
+        datasets.urls, 'phoible',
+        'http://127.0.0.1:{}/phoible.csv'.format(server.server_port)
+    )
+    load = datasets.Phoible._load
+    def slow_load(self, contents):
+        time.sleep(0.5)
+        load(self, contents)
+    monkeypatch.setattr(datasets.Phoible, '_load', slow_load)
+    async def heartbeat(gaps, done):
+        last = time.monotonic()
+        while not done.is_set():
+            await asyncio.sleep(0.01)
+            gaps.append(time.monotonic() - last)
+            last = time.monotonic()
+    async def main():
+        gaps = []
+        done = asyncio.Event()
+        beat = asyncio.ensure_future(heartbeat(gaps, done))
+        phoible = await datasets.Phoible.acreate(aggregated=False)
+        done.set()
+        await beat
+        return phoible, gaps
+    try:
+        phoible, gaps = asyncio.run(main())
+    finally:
+        server.shutdown()
+    assert list(phoible.full_data.Phoneme) == ['a']
+    #The loop was not blocked while the data was parsed
+    assert len(gaps) > 10 and max(gaps) < 0.25
+
+
+def test_memoization(wals_server, monkeypatch):
+    monkeypatch.setitem(datasets.urls, 'wals', wals_server)
+    fetched = []
+    fetch = datasets._fetch
+    monkeypatch.setattr(
+        datasets, '_fetch', lambda url: fetched.append(url) or fetch(url)
+    )
+    wals = datasets.Wals('1a')
+    df = wals.get_df()
+    df['language'] = 'Changed'
+    assert list(wals.get_df().language) == ['Russian']
+    assert len(fetched) == 1
+    wals.features = ('1a', '2a')
+    wals.get_df()
+    assert len(fetched) == 3
+
+
+def test_memoization_keys(monkeypatch):
+    assert datasets._freeze(numpy.array(['a', 'b'])) == ('a', 'b')
+    assert datasets._freeze(pandas.Index(['a'])) == ('a',)
+    assert datasets._freeze('ab') == 'ab'
+    made = []
+    monkeypatch.setattr(datasets.Autotyp, '_fetch_tables', lambda self: None)
+    monkeypatch.setattr(
+        datasets.Autotyp, '_make_df',
+        lambda self, contents, strip_na, na_mode: \
+            made.append(strip_na) or pandas.DataFrame({'a': [1]})
+    )
+    autotyp = datasets.Autotyp('Register')
+    autotyp.get_df(strip_na=numpy.array(['a']))
+    autotyp.get_df(strip_na=pandas.Index(['a']))
+    assert len(made) == 1
+    unhashable = [type('Columns', (object,), {'__hash__': None})()]
+    autotyp.get_df(strip_na=unhashable)
+    autotyp.get_df(strip_na=unhashable)
+    assert len(made) == 3
+
+
+def test_memoization_threads(monkeypatch):
+    monkeypatch.setattr(datasets.Autotyp, '_fetch_tables', lambda self: None)
+    monkeypatch.setattr(
+        datasets.Autotyp, '_make_df',
+        lambda self, contents, strip_na, na_mode: pandas.DataFrame({'a': [1]})
+    )
+    autotyp = datasets.Autotyp('Register')
+    autotyp.cache_size = 2
+    #As aget_df calls of the same object do in the default executor
+    with concurrent.futures.ThreadPoolExecutor(8) as executor:
+        tables = list(executor.map(
+            lambda i: autotyp.get_df(strip_na=[str(i % 5)]), range(500)
+        ))
+    assert len(tables) == 500
+    assert len(autotyp._df_cache) == 2
+
+
+def test_refresh(wals_server, monkeypatch, tmpdir):
+    monkeypatch.setitem(datasets.urls, 'wals', wals_server)
+    url = wals_server.format('1A')
+    datasets.set_cache_directory(str(tmpdir))
+    try:
+        wals = datasets.Wals('1a')
+        wals.get_df()
+        assert wals.refresh() == []
+        manifest = datasets.get_manifest()[url]
+        assert manifest['etag'] == '"v1"'
+        assert manifest['snapshot'] == manifest['sha256']
+        snapshot_format = manifest['snapshot_format']
+        try:
+            import pyarrow
+            assert snapshot_format == 'parquet'
+        except ImportError:
+            assert snapshot_format == 'pickle'
+        assert os.path.exists(datasets._cache_path(url, '.' + snapshot_format))
+        datasets.set_cache_directory(str(tmpdir))
+        parsed = []
+        monkeypatch.setattr(
+            datasets.Wals, '_read_wals_page',
+            staticmethod(lambda feature, page: parsed.append(feature))
+        )
+        assert list(datasets.Wals('1a').get_df().wals_code) == ['rus']
+        assert not parsed
+    finally:
+        datasets.set_cache_directory(None)
+
+
+def test_ranged_download(monkeypatch, tmpdir):
+    content = bytes(range(256)) * 4
+    requested = []
+    failed = []
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def do_HEAD(self):
+            self.send_response(200)
+            self.send_header('Content-Length', str(len(content)))
+            self.send_header('Accept-Ranges', 'bytes')
+            self.send_header('ETag', '"v1"')
+            self.end_headers()
+        def do_GET(self):
+            start, end = map(int, self.headers['Range'][6:].split('-'))
+            requested.append(start)
+            if start == 300 and not failed:
+                failed.append(start)
+                self.send_response(503)
+                self.end_headers()
+                return
+            self.send_response(206)
+            self.send_header('Content-Length', str(end - start + 1))
+            self.end_headers()
+            self.wfile.write(content[start:end + 1])
+        def log_message(self, *args):
+            pass
+    server = http.server.HTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = 'http://127.0.0.1:{}/phoible.csv'.format(server.server_port)
+    monkeypatch.setattr(datasets.tempfile, 'gettempdir', lambda: str(tmpdir))
+    datasets.set_session(retries=0, range_threshold=1, range_chunk_size=100)
+    try:
+        with pytest.raises(requests.HTTPError):
+            datasets._fetch_large(url)
+        requested.clear()
+        assert datasets._fetch_large(url) == content
+        assert 300 in requested and 0 not in requested
+        datasets.checksums[url] = '0' * 64
+        with pytest.raises(ValueError):
+            datasets._fetch_large(url)
+    finally:
+        datasets.checksums.clear()
+        datasets.set_session()
+        server.shutdown()
+
+
+def test_ranged_download_changed(monkeypatch, tmpdir):
+    content = bytes(range(256)) * 4
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def do_HEAD(self):
+            self.send_response(200)
+            self.send_header('Content-Length', str(len(content)))
+            self.send_header('Accept-Ranges', 'bytes')
+            self.send_header('ETag', '"v1"')
+            self.end_headers()
+        def do_GET(self):
+            #The file has changed: If-Range does not match
+            self.send_response(200)
+            self.send_header('Content-Length', str(len(content)))
+            self.end_headers()
+            self.wfile.write(content)
+        def log_message(self, *args):
+            pass
+    server = http.server.HTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = 'http://127.0.0.1:{}/phoible.csv'.format(server.server_port)
+    monkeypatch.setattr(datasets.tempfile, 'gettempdir', lambda: str(tmpdir))
+    datasets.set_session(retries=0, range_threshold=1, range_chunk_size=100)
+    try:
+        with pytest.raises(requests.HTTPError, match='changed'):
+            datasets._fetch_large(url)
+        assert not tmpdir.join('lingtypology').listdir()
+    finally:
+        datasets.set_session()
+        server.shutdown()
+
+
+def test_verify_before_caching(wals_server, tmpdir):
+    url = wals_server.format('1A')
+    datasets.set_cache_directory(str(tmpdir))
+    datasets.checksums[url] = '0' * 64
+    try:
+        with pytest.raises(ValueError):
+            datasets._fetch_large(url)
+        assert url not in datasets.get_manifest()
+        del datasets.checksums[url]
+        assert datasets._fetch_large(url).startswith(b'Citation')
+        assert url in datasets.get_manifest()
+    finally:
+        datasets.checksums.clear()
+        datasets.set_cache_directory(None)
+
+
+def test_refresh_verify(monkeypatch, tmpdir):
+    import hashlib
+    versions = [b'Glottocode,Phoneme\nrussian1263,a\n']
+    requests_made = []
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def respond(self, body):
+            requests_made.append(self.command)
+            etag = '"v{}"'.format(len(versions))
+            if self.headers.get('If-None-Match') == etag:
+                self.send_response(304)
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header('ETag', etag)
+            self.send_header('Content-Length', str(len(versions[-1])))
+            self.end_headers()
+            if body:
+                self.wfile.write(versions[-1])
+        def do_HEAD(self):
+            self.respond(False)
+        def do_GET(self):
+            self.respond(True)
+        def log_message(self, *args):
+            pass
+    server = http.server.HTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = 'http://127.0.0.1:{}/phoible.csv'.format(server.server_port)
+    monkeypatch.setitem(datasets.urls, 'phoible', url)
+    datasets.checksums[url] = hashlib.sha256(versions[0]).hexdigest()
+    datasets.set_cache_directory(str(tmpdir))
+    try:
+        phoible = datasets.Phoible(aggregated=False)
+        assert list(phoible.full_data.Phoneme) == ['a']
+        requests_made.clear()
+        #The verified cached copy is used without any request
+        datasets.Phoible(aggregated=False)
+        assert not requests_made
+        assert phoible.refresh() == []
+        assert requests_made == ['HEAD']
+        versions.append(b'Glottocode,Phoneme\nrussian1263,b\n')
+        with pytest.raises(ValueError, match='Checksum'):
+            phoible.refresh()
+        phoible = datasets.Phoible(aggregated=False)
+        assert list(phoible.full_data.Phoneme) == ['a']
+    finally:
+        datasets.checksums.clear()
+        datasets.set_cache_directory(None)
+        server.shutdown()
+
+
+def test_iter_batches(wals_server, monkeypatch):
+    monkeypatch.setitem(datasets.urls, 'wals', wals_server)
+    wals = datasets.Wals('1a', '2a')
+    batches = list(wals.iter_batches(chunksize=1, join_how='outer'))
+    assert len(batches) == 1
+    assert list(batches[0].columns) == list(wals.get_df(join_how='outer').columns)
+    assert [row['wals_code'] for row in wals.iter_rows()] == ['rus']
+
+
+def test_fetch(wals_server, monkeypatch, tmpdir):
+    import lingtypology.fetch
+    monkeypatch.setitem(datasets.urls, 'wals', wals_server)
+    cache = str(tmpdir)
+    try:
+        assert lingtypology.fetch.main(['--cache', cache, '--wals', '1a', '2a']) == 0
+        with open(os.path.join(cache, 'fetch-manifest.json')) as f:
+            items = json.load(f)['items']
+        assert items['wals 1A']['status'] == 'ok'
+        datasets.set_cache_directory(cache, offline=True)
+        monkeypatch.setattr(datasets, 'get_session', None)
+        assert list(datasets.Wals('1a', '2a').get_df().wals_code) == ['rus']
+    finally:
+        datasets.set_cache_directory(None)
+
+
 def test_autotyp():
     datasets.Autotyp('Gender', 'Agreement').get_df()
 
+
 def test_afbo():
     datasets.AfBo(
         'adverbializer',
         'case: non-locative peripheral case'
     ).get_df()
 
+
 def test_sails():
     datasets.Sails('ICU10', 'ICU11').get_df()
 
+
+def test_sails_feature_descriptions():
+    descriptions = datasets.Sails().feature_descriptions(
+        'ICU11', 'NOT_A_FEATURE', 'ICU10'
+    )
+    assert list(descriptions.Feature) == ['ICU11', 'NOT_A_FEATURE', 'ICU10']
+    assert descriptions.Description.isna().tolist() == [False, True, False]
+
+
+def test_cldf(tmpdir):
+    tmpdir.join('languages.csv').write('ID,Name,Glottocode\nl1,L1,aaaa1234\nl2,L2,bbbb1234\n')
+    tmpdir.join('parameters.csv').write('ID,Name\nA,Feature A\nB,Feature B\n')
+    tmpdir.join('values.csv').write(
+        'ID,Language_ID,Parameter_ID,Value\n1,l2,A,1\n2,l1,A,0\n3,l1,B,?\n'
+    )
+    cldf = datasets.CLDF(str(tmpdir))
+    assert str(cldf.values.Value.dtype) == 'category'
+    df = cldf.pivot(['B', 'A', 'Z'])
+    assert list(df.columns) == ['B', 'A']
+    assert list(df.index) == ['l1', 'l2']
+    assert df.loc['l1', 'B'] == '?' and df.loc['l2', 'A'] == '1'
+    assert pandas.isna(df.loc['l2', 'B'])
+
+
+def test_sails_order():
+    import io
+    import zipfile
+    archive = io.BytesIO()
+    with zipfile.ZipFile(archive, 'w') as thezip:
+        thezip.writestr(
+            'languages.csv',
+            'ID,Name,Glottocode,Latitude,Longitude\n'
+            'one,Lang One,,1,1\ntwo,Lang Two,,2,2\nthree,Lang Three,,3,3\n'
+        )
+        thezip.writestr('parameters.csv', 'ID,Name\nA,Feature A\nB,Feature B\n')
+        thezip.writestr(
+            'values.csv',
+            'ID,Language_ID,Parameter_ID,Value\n'
+            '1,two,A,1\n2,one,A,0\n3,three,B,1\n4,one,B,0\n'
+        )
+    sails = datasets.Sails('A', 'B', download=False)
+    sails.show_citation = False
+    sails._load(archive.getvalue())
+    #Several features: sorted by language ID, as the merge of the features did
+    assert list(sails.get_df().language) == ['Lang One', 'Lang Three', 'Lang Two']
+    sails.features = ('A',)
+    #One feature: the order of its values
+    assert list(sails.get_df().language) == ['Lang Two', 'Lang One']
+
+
 def test_phoible():
     datasets.Phoible().get_df(strip_na=['tones'])
     datasets.Phoible(aggregated=False).get_df()
+
+
+def test_phoible_nullable():
+    df = datasets.Phoible().get_df(strip_na=['tones'], na_mode='nullable')
+    assert str(df.tones.dtype) == 'Int64'
+    assert not df.tones.isna().any()